@@ -12,14 +12,24 @@ All 8 live trading enhancements:
 """
 
 from werkzeug.middleware.proxy_fix import ProxyFix
-from flask import Flask, jsonify, Response, request, session, redirect, send_from_directory
+from flask import Flask, Response, request, session, redirect, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from apscheduler.schedulers.background import BackgroundScheduler
 from scanner import run_scanner, run_morning_scan, run_backtest
-from functools import wraps
-import json, os, threading, statistics, hashlib, secrets
+from functools import wraps, lru_cache
+from contextlib import contextmanager
+from operator import itemgetter
+from collections import Counter
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os, re, copy, json, time, gzip, mmap, heapq, threading, hashlib, hmac, secrets
+import orjson
 import numpy as np
 import yfinance as yf
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
 
 # Google Sheets integration (optional — only active if credentials are configured)
 try:
@@ -30,7 +40,27 @@ except ImportError:
     GSHEETS_AVAILABLE = False
     print("[SHEETS] gspread not installed — Google Sheets sync disabled")
 
+# Response compression (optional — JSON goes out uncompressed without it)
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+    print("[COMPRESS] flask-compress not installed — responses will not be compressed")
+
+# numpy scalars/arrays serialize natively; anything else unknown (datetimes etc.) falls back to str()
+ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Routes Flask's own JSON encoding and request.get_json() parsing through orjson."""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str, option=ORJSON_OPTS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)   # decode errors subclass ValueError, so Flask's 400 handling is unchanged
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 app.secret_key = os.environ.get('SECRET_KEY', 'dayedge-secret-key-2026-xK9mP2vL7n')
 app.config['SESSION_COOKIE_SECURE']      = os.environ.get('RAILWAY_ENVIRONMENT') is not None
@@ -38,10 +68,61 @@ app.config['SESSION_COOKIE_HTTPONLY']    = True
 app.config['SESSION_COOKIE_SAMESITE']   = 'Lax'
 app.config['SESSION_COOKIE_NAME']       = 'dayedge_v5_session'
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
+app.config['COMPRESS_MIN_SIZE']          = 2048
+app.config['COMPRESS_ALGORITHM']         = ['br', 'gzip']
+if COMPRESS_AVAILABLE:
+    Compress(app)
 
 latest_results = None
 latest_morning = None
-scan_status = {"running": False, "task": None, "started": None, "error": None}
+@dataclass(frozen=True)
+class ScanStatus:
+    running: bool       = False
+    task:    str | None = None
+    started: str | None = None
+    error:   str | None = None
+
+# Background runners swap in a new immutable snapshot under the lock; readers just grab the reference
+scan_status  = ScanStatus()
+_STATUS_LOCK = threading.Lock()
+
+def set_status(**changes):
+    global scan_status
+    with _STATUS_LOCK:
+        scan_status = replace(scan_status, **changes)
+
+def get_status():
+    with _STATUS_LOCK:
+        return scan_status
+
+# Manual scan/morning/backtest runs go through one small pool; _CURRENT_FUTURE is the run in flight
+_EXECUTOR       = ThreadPoolExecutor(max_workers=2, thread_name_prefix='scan')
+_CURRENT_FUTURE = None
+
+# Short network-bound per-symbol work inside request handlers (news lookups etc.)
+_IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='io')
+# Leaf per-symbol history fetches; kept apart from _IO_POOL because fetch_histories itself
+# runs on _IO_POOL threads, and waiting on the same pool from inside it can deadlock
+_HIST_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='hist')
+
+# The scanner entry points are pure-Python/pandas loops that would hold the GIL for minutes;
+# run them in spawned worker processes so request threads stay responsive. Spawn (not fork)
+# keeps the children free of this process's threads and locks — they only import scanner.
+# Each run gets its own short-lived child: a resident pool would keep pandas/yfinance loaded
+# between the few scheduled scans a day, and the spawn cost is small next to a scan.
+_SPAWN = multiprocessing.get_context('spawn')
+
+def run_in_process(fn, *args):
+    """Run a top-level scanner function in a fresh worker process and return its result.
+    A dead worker (usually memory pressure) gets one retry in a new process; the scan is never
+    run inside the web process, where the same failure would take the server down with it."""
+    for attempt in (1, 2):
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=_SPAWN) as pool:
+                return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            print(f"[SCAN] worker process died running {fn.__name__} (attempt {attempt})")
+    raise RuntimeError(f"{fn.__name__} failed: scan worker process died twice")
 
 # ── AUTH ──────────────────────────────────────────────────────────────────────
 
@@ -50,10 +131,16 @@ def hash_pw(pw):
 
 def get_users():
     """Always read from env so Railway variable updates take effect immediately."""
-    admin_user = os.environ.get('ADMIN_USER', 'admin').strip().lower()
-    admin_pass = os.environ.get('ADMIN_PASS', 'dayedge_admin_2026').strip()
-    user_user  = os.environ.get('USER_USER',  'trader').strip().lower()
-    user_pass  = os.environ.get('USER_PASS',  'dayedge_trader_2026').strip()
+    return _build_users(
+        os.environ.get('ADMIN_USER', 'admin').strip().lower(),
+        os.environ.get('ADMIN_PASS', 'dayedge_admin_2026').strip(),
+        os.environ.get('USER_USER',  'trader').strip().lower(),
+        os.environ.get('USER_PASS',  'dayedge_trader_2026').strip(),
+    )
+
+@lru_cache(maxsize=1)
+def _build_users(admin_user, admin_pass, user_user, user_pass):
+    # Keyed on the env values, so hashes are only recomputed when a variable actually changes
     print(f"[AUTH] Users configured: admin_user={admin_user!r}, user_user={user_user!r}")
     return {
         admin_user: {'password_hash': hash_pw(admin_pass), 'role': 'admin'},
@@ -70,7 +157,7 @@ def login_required(f):
     def decorated(*args, **kwargs):
         if 'username' not in session:
             if request.path.startswith('/api/'):
-                return jsonify({'error': 'Not authenticated', 'redirect': '/login'}), 401
+                return ojsonify({'error': 'Not authenticated', 'redirect': '/login'}), 401
             return redirect('/login')
         return f(*args, **kwargs)
     return decorated
@@ -79,9 +166,9 @@ def admin_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         if 'username' not in session:
-            return jsonify({'error': 'Not authenticated', 'redirect': '/login'}), 401
+            return ojsonify({'error': 'Not authenticated', 'redirect': '/login'}), 401
         if session.get('role') != 'admin':
-            return jsonify({'error': 'Admin access required'}), 403
+            return ojsonify({'error': 'Admin access required'}), 403
         return f(*args, **kwargs)
     return decorated
 
@@ -98,34 +185,365 @@ def data_path(filename):
 
 # ── HELPERS ──────────────────────────────────────────────────────────────────
 
-def load_file(path):
+# Parsed JSON files keyed by path -> ((mtime_ns, size), obj); re-parsed only when the file changes
+_FILE_CACHE = {}
+_FILE_CACHE_LOCK = threading.Lock()
+MMAP_MIN_SIZE    = 16 << 20   # files above this are parsed through mmap
+
+def load_file(path, mutable=False):
+    """Parsed JSON file, or None. The cached object is shared between callers and must not be
+    modified — pass mutable=True to get a private deep copy to edit and save_file back."""
+    obj = _load_cached(path)
+    return copy.deepcopy(obj) if mutable and obj is not None else obj
+
+def _load_cached(path):
     try:
-        if os.path.exists(path):
-            with open(path) as f:
-                return json.load(f)
-    except:
-        pass
-    return None
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    with _FILE_CACHE_LOCK:
+        hit = _FILE_CACHE.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+    try:
+        with open(path, 'rb') as f:
+            if st.st_size > MMAP_MIN_SIZE:
+                # Parse straight from the page cache instead of copying a huge file into a bytes object
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        try:
+                            obj = orjson.loads(view)
+                        except orjson.JSONDecodeError:
+                            obj = json.loads(bytes(view))   # older files written by json.dump may contain NaN
+            else:
+                raw = f.read()
+                try:
+                    obj = orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    obj = json.loads(raw)   # older files written by json.dump may contain NaN
+    except (OSError, ValueError) as e:
+        print(f"Load error {path}: {e}")
+        return None
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[path] = (key, obj)
+    return obj
 
-def save_file(path, data):
+def save_file(path, data, pretty=True):
+    # Serialize in one shot, write to a temp file, then swap it in so readers never see a partial file.
+    # pretty=False writes compact JSON for machine-only cache files. Returns False if the write failed.
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        opts = ORJSON_OPTS | (orjson.OPT_INDENT_2 if pretty else 0)
+        body = orjson.dumps(data, default=str, option=opts)
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            f.write(body)
+        os.replace(tmp, path)
+        # Refresh the read cache from what was just written, so the next load_file skips the disk.
+        # A decoded copy (not `data` itself) keeps callers' later mutations out of the cache.
+        st = os.stat(path)
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE[path] = ((st.st_mtime_ns, st.st_size), orjson.loads(body))
+        return True
     except Exception as e:
         print(f"Save error {path}: {e}")
+        try: os.remove(tmp)
+        except OSError: pass
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE.pop(path, None)   # next load re-reads what is actually on disk
+        return False
+
+# EOD history is an append-only NDJSON log — one EOD snapshot per line, later lines win for the same date
+EOD_HISTORY_DAYS   = 60
+EOD_HISTORY_FILE   = "eod_history.ndjson"
+EOD_HISTORY_LEGACY = "eod_history.json"
+
+def load_history():
+    """Saved EOD days, oldest first, one per date, capped at EOD_HISTORY_DAYS. Treat as read-only (cached)."""
+    days, _ = _read_history()
+    return days
+
+_HISTORY_LOCK = threading.Lock()
+
+@contextmanager
+def _history_lock():
+    """Serializes history appends/compaction: a thread lock in-process, plus an flock on a
+    sidecar file so gunicorn workers (manual EOD refresh vs. the scheduled save) can't interleave."""
+    with _HISTORY_LOCK:
+        try:
+            import fcntl
+        except ImportError:
+            yield   # no flock on this platform — the thread lock still covers this process
+            return
+        with open(data_path(EOD_HISTORY_FILE + ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def _migrate_legacy_history():
+    """One-time migration from the old whole-array JSON file. Caller holds _history_lock.
+    Raises if the legacy file exists but can't be read or migrated — creating the log anyway
+    would start it empty and the old history would never be picked up again."""
+    legacy_path = data_path(EOD_HISTORY_LEGACY)
+    if os.path.exists(data_path(EOD_HISTORY_FILE)) or not os.path.exists(legacy_path):
+        return
+    legacy = load_file(legacy_path)
+    if legacy is None:
+        raise RuntimeError(f"could not read legacy history {legacy_path}; not migrating")
+    if legacy and not _write_history(legacy):
+        raise RuntimeError(f"could not migrate legacy history {legacy_path}")
+
+def _read_history(migrate=True):
+    path = data_path(EOD_HISTORY_FILE)
+    if migrate and not os.path.exists(path) and os.path.exists(data_path(EOD_HISTORY_LEGACY)):
+        try:
+            with _history_lock():
+                _migrate_legacy_history()
+        except RuntimeError as e:
+            print(f"[HISTORY] {e}")
+            return [], 0
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [], 0
+    key = ("ndjson", st.st_mtime_ns, st.st_size)
+    with _FILE_CACHE_LOCK:
+        hit = _FILE_CACHE.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+    by_date, lines = {}, 0
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                lines += 1
+                try:
+                    day = orjson.loads(line)
+                except ValueError:
+                    print(f"[HISTORY] Skipping corrupt line in {path}")
+                    continue
+                by_date[day.get("date", "")] = day
+    except OSError as e:
+        print(f"Load error {path}: {e}")
+        return [], 0
+    # Newest EOD_HISTORY_DAYS dates by partial selection, then back to oldest-first
+    days = [by_date[d] for d in reversed(heapq.nlargest(EOD_HISTORY_DAYS, by_date))]
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[path] = (key, (days, lines))
+    return days, lines
+
+def _write_history(days):
+    """Compaction: rewrite the log atomically with just the given days. Returns False if the write failed."""
+    path = data_path(EOD_HISTORY_FILE)
+    tmp  = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        body = b"".join(orjson.dumps(d, default=str, option=ORJSON_OPTS) + b"\n"
+                        for d in days)
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            f.write(body)
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        print(f"Save error {path}: {e}")
+        try: os.remove(tmp)
+        except OSError: pass
+        return False
+
+def _same_snapshot(a, b):
+    return len(a) == len(b) and all(k == "timestamp" or a.get(k) == v for k, v in b.items())
+
+def append_history(eod):
+    """Append one EOD snapshot (O(1) write); compacts once duplicates/old days pile up. Returns days kept."""
+    path = data_path(EOD_HISTORY_FILE)
+    # Held across read, append and compaction, so an append can't land between the
+    # compaction's read and its os.replace and be silently dropped
+    with _history_lock():
+        _migrate_legacy_history()
+        days, _ = _read_history(migrate=False)   # lock already held
+        if days and days[-1].get("date") == eod.get("date") and _same_snapshot(days[-1], eod):
+            return len(days)   # a refresh that changed nothing but the timestamp — skip the write
+        with open(path, "ab") as f:
+            f.write(orjson.dumps(eod, default=str, option=ORJSON_OPTS) + b"\n")
+        days, lines = _read_history(migrate=False)
+        if lines > len(days) + EOD_HISTORY_DAYS // 2:
+            _write_history(days)
+        return len(days)
+
+# Raw JSON file bytes keyed by path -> ((mtime_ns, size), body, etag, gzipped); served as-is without a parse/re-encode
+_RAW_CACHE = {}
+GZIP_MIN_SIZE = 2048
+
+def load_raw(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _RAW_CACHE.get(path)
+    if hit and hit[0] == key:
+        return hit
+    try:
+        with open(path, 'rb') as f:
+            body = f.read()
+    except OSError:
+        return None
+    # Compress once per file version so polls don't pay for gzip on every request
+    gz  = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+    hit = _RAW_CACHE[path] = (key, body, hashlib.blake2b(body, digest_size=8).hexdigest(), gz)
+    return hit
+
+def raw_json_response(raw):
+    """Serve cached file bytes with an ETag; answers 304 when the client already has them."""
+    _, body, etag, gz = raw
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    elif gz is not None and 'gzip' in request.accept_encodings:
+        resp = Response(gz, mimetype='application/json')
+        resp.headers['Content-Encoding'] = 'gzip'
+    else:
+        resp = Response(body, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.vary.add('Accept-Encoding')
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
+def ojsonify(obj):
+    """JSON response via orjson — serializes numpy scalars/arrays natively, no pre-walk needed."""
+    body = orjson.dumps(obj, default=str, option=ORJSON_OPTS)
+    return Response(body, mimetype='application/json')
+
+_NOW_STRS = (0, "", "")   # (epoch second, isoformat, YYYY-MM-DD)
+
+def _now_strs():
+    """(isoformat, YYYY-MM-DD) for the current wall-clock second, formatted once per second."""
+    global _NOW_STRS
+    it     = int(time.time())
+    cached = _NOW_STRS
+    if cached[0] != it:
+        dt     = datetime.fromtimestamp(it)
+        cached = _NOW_STRS = (it, dt.isoformat(), dt.strftime("%Y-%m-%d"))
+    return cached[1], cached[2]
+
+@app.after_request
+def add_etag(resp):
+    """ETag every buffered JSON GET response so unchanged polls come back as an empty 304."""
+    if (request.method == 'GET' and resp.status_code == 200 and resp.mimetype == 'application/json'
+            and not resp.direct_passthrough and not resp.is_streamed and 'ETag' not in resp.headers):
+        resp.set_etag(hashlib.blake2b(resp.get_data(), digest_size=8).hexdigest())
+        resp.cache_control.no_cache = True
+        resp = resp.make_conditional(request)
+    return resp
+
+# Ticker objects keyed by symbol -> (created_at, Ticker). yfinance memoizes .info/.news on the
+# object forever, so entries are rebuilt after TICKER_TTL to keep those from going stale.
+TICKER_TTL    = 600
+_TICKER_CACHE = {}
+
+def _ticker(sym):
+    hit = _TICKER_CACHE.get(sym)
+    if hit and time.time() - hit[0] < TICKER_TTL:
+        return hit[1]
+    t = yf.Ticker(sym)
+    _TICKER_CACHE[sym] = (time.time(), t)
+    return t
+
+NY_TZ = ZoneInfo('America/New_York')
+
+# The few Ticker.info fields the routes read; previousClose rolls with the NY session, so the slow
+# .info call is made at most once per symbol per New York date: symbol -> (YYYY-MM-DD, fields).
+# Keyed on NY time, not the server's, so a UTC host doesn't roll over at 20:00 ET and then
+# serve the previous session's close all through the next trading day.
+INFO_FIELDS = ("shortName", "previousClose")
+_INFO_CACHE = {}
+
+def ticker_info(sym, ticker=None):
+    """Subset of Ticker.info (only keys that were present). Raises if the lookup fails."""
+    today = datetime.now(NY_TZ).date().isoformat()
+    hit   = _INFO_CACHE.get(sym)
+    if hit and hit[0] == today:
+        return hit[1]
+    info   = (ticker or _ticker(sym)).info
+    fields = {k: info[k] for k in INFO_FIELDS if k in info}
+    _INFO_CACHE[sym] = (today, fields)
+    return fields
+
+HLCV  = ['High', 'Low', 'Close', 'Volume']   # column order for the float64 bar arrays below
+OHLCV = ['Open'] + HLCV
+
+def session_vwap(hlcv):
+    """VWAP as of the last bar from an (n, 4) High/Low/Close/Volume array — typical price weighted by volume."""
+    tp = (hlcv[:, 0] + hlcv[:, 1] + hlcv[:, 2]) * (1.0 / 3.0)
+    v  = hlcv[:, 3]
+    ok = ~(np.isnan(tp) | np.isnan(v))
+    return float(np.dot(tp[ok], v[ok]) / v[ok].sum())
+
+def prev_session(day):
+    """The weekday before `day` — the NY session whose close is `day`'s previous close (holidays not modelled)."""
+    day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+def _daily_stats(df, before):
+    """prev_close / avg_daily_vol from daily bars dated before `before` (a NY date), so a partial or
+    pre-open bar for the current day never counts; None if there are no such bars.
+    This is the one meaning of prev_close for both the precomputed and the live premarket path."""
+    if df is None or len(df) == 0:
+        return None
+    idx  = df.index.tz_convert(NY_TZ) if df.index.tz is not None else df.index
+    done = df[(idx.date < before) & df['Close'].notna().to_numpy()]
+    if not len(done):
+        return None
+    last = done.index[-1]
+    last = last.tz_convert(NY_TZ) if last.tzinfo is not None else last
+    return {"session":       last.date().isoformat(),
+            "prev_close":    round(float(done['Close'].iat[-1]), 2),
+            "avg_daily_vol": int(done['Volume'].mean())}
+
+def ema_last(values, span):
+    """Last value of pandas' ewm(span=span).mean() (adjust=True) as one weighted dot — no full series."""
+    x  = np.asarray(values, dtype=np.float64)
+    w  = (1.0 - 2.0 / (span + 1)) ** np.arange(len(x) - 1, -1, -1)
+    ok = ~np.isnan(x)
+    return float(np.dot(w[ok], x[ok]) / w[ok].sum())
+
+def fetch_histories(symbols, **kwargs):
+    """Download bars for many symbols in one batched yfinance call.
+    Returns {symbol: DataFrame}; anything missing from the batch is fetched per-symbol, concurrently."""
+    symbols = list(dict.fromkeys(symbols))
+    frames  = {}
+    if not symbols:
+        return frames
+    try:
+        data = yf.download(symbols, group_by='ticker', threads=True, progress=False, **kwargs)
+        if data is not None and len(data):
+            for sym in symbols:
+                if data.columns.nlevels > 1:
+                    if sym not in data.columns.get_level_values(0):
+                        continue
+                    df = data[sym]
+                else:
+                    df = data
+                df = df.dropna(how='all')
+                if len(df):
+                    frames[sym] = df
+    except Exception as e:
+        print(f"Batch download error: {e}")
+    def one(sym):
+        try:
+            return _ticker(sym).history(**kwargs)
+        except Exception as e:
+            print(f"History fetch error {sym}: {e}")
+            return None
 
-def make_serializable(obj):
-    if isinstance(obj, dict):
-        return {k: make_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_serializable(i) for i in obj]
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    return obj
+    missing = [s for s in symbols if s not in frames]
+    for sym, df in zip(missing, _HIST_POOL.map(one, missing)):
+        if df is not None:
+            frames[sym] = df
+    return frames
 
 # ── GOOGLE SHEETS SYNC ───────────────────────────────────────────────────────
 
@@ -144,10 +562,19 @@ SHEET_COLUMNS = [
     "Best Window", "Scan Timestamp"
 ]
 
+SHEETS_CLIENT_TTL = 3300   # re-authorize a bit before the 1h service-account token expires
+_SHEETS_CLIENT    = (0.0, None)   # (expires_at monotonic, authorized gspread client)
+_SPREADSHEETS     = {}            # sheet id -> Spreadsheet handle opened with the cached client
+_JOURNAL_SHEETS   = {}            # sheet id -> first worksheet (the morning journal)
+
 def get_sheets_client():
-    """Build authenticated Google Sheets client from env var or credentials file."""
+    """Build authenticated Google Sheets client from env var or credentials file (reused until it nears expiry)."""
+    global _SHEETS_CLIENT
     if not GSHEETS_AVAILABLE:
         return None
+    expires, client = _SHEETS_CLIENT
+    if client is not None and time.monotonic() < expires:
+        return client
     try:
         scopes = [
             "https://www.googleapis.com/auth/spreadsheets",
@@ -156,8 +583,7 @@ def get_sheets_client():
         # Option 1: credentials JSON stored as env var (recommended for Railway)
         creds_json = os.environ.get("GOOGLE_CREDENTIALS_JSON")
         if creds_json:
-            import json as _json
-            creds_dict = _json.loads(creds_json)
+            creds_dict = orjson.loads(creds_json)
             creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
         # Option 2: credentials file on disk
         elif os.path.exists("google_credentials.json"):
@@ -165,17 +591,31 @@ def get_sheets_client():
         else:
             print("[SHEETS] No credentials found — set GOOGLE_CREDENTIALS_JSON env var")
             return None
-        return gspread.authorize(creds)
+        client = gspread.authorize(creds)
+        _SPREADSHEETS.clear()
+        _JOURNAL_SHEETS.clear()
+        _SHEETS_CLIENT = (time.monotonic() + SHEETS_CLIENT_TTL, client)
+        return client
     except Exception as e:
         print(f"[SHEETS] Auth error: {e}")
         return None
 
+def open_spreadsheet(client, sid):
+    """Spreadsheet handle for sid — the metadata fetch happens once per client, not once per call."""
+    sh = _SPREADSHEETS.get(sid)
+    if sh is None:
+        sh = _SPREADSHEETS[sid] = client.open_by_key(sid)
+    return sh
+
 def get_or_create_sheet(client, spreadsheet_id=None):
     """Open existing sheet by ID or create a new one named DayEdge Journal."""
     try:
         sheet_id = spreadsheet_id or os.environ.get("GOOGLE_SHEET_ID")
         if sheet_id:
-            return client.open_by_key(sheet_id).sheet1
+            ws = _JOURNAL_SHEETS.get(sheet_id)
+            if ws is None:
+                ws = _JOURNAL_SHEETS[sheet_id] = open_spreadsheet(client, sheet_id).sheet1
+            return ws
         else:
             # Create new spreadsheet
             sh = client.create("DayEdge Morning Journal")
@@ -216,7 +656,7 @@ def save_scan_to_sheets(scan_data):
         sid      = sheet_id or saved.get("id")
         if not sid: return
 
-        sh = client.open_by_key(sid)
+        sh = open_spreadsheet(client, sid)
 
         # Get or create "Last Scan" worksheet
         try:
@@ -226,9 +666,8 @@ def save_scan_to_sheets(scan_data):
             ws = sh.add_worksheet(title=PERSISTENCE_SHEET, rows=5, cols=2)
 
         # Store as two cells: timestamp and full JSON
-        import json as _json
         ts   = scan_data.get("timestamp", datetime.now().isoformat())
-        data = _json.dumps(scan_data)
+        data = orjson.dumps(scan_data, default=str, option=ORJSON_OPTS).decode()
         ws.update("A1", [["timestamp", ts], ["data", data]])
         print(f"[SHEETS] Evening scan saved for persistence ({len(scan_data.get('results',[]))} stocks)")
     except Exception as e:
@@ -246,7 +685,7 @@ def restore_scan_from_sheets():
         sid      = sheet_id or saved.get("id")
         if not sid: return None
 
-        sh = client.open_by_key(sid)
+        sh = open_spreadsheet(client, sid)
         try:
             ws   = sh.worksheet(PERSISTENCE_SHEET)
             rows = ws.get_all_values()
@@ -254,10 +693,9 @@ def restore_scan_from_sheets():
             return None
 
         # Find the data row
-        import json as _json
         for row in rows:
             if len(row) >= 2 and row[0] == "data":
-                data = _json.loads(row[1])
+                data = orjson.loads(row[1])
                 print(f"[SHEETS] Restored evening scan from sheets: {len(data.get('results',[]))} stocks, ts={data.get('timestamp','?')}")
                 # Re-save locally so scanner can use it
                 save_file(data_path("scan_results.json"), data)
@@ -268,6 +706,10 @@ def restore_scan_from_sheets():
         return None
 
 
+# {"sheet": id, "keys": [today's date_symbol keys]}. Rows deleted by hand from the sheet stay in
+# the index and keep suppressing re-adds until this file is removed (it's rebuilt from the sheet).
+JOURNAL_SEEN_FILE = "journal_seen.json"
+
 def sync_morning_to_sheets(golist_data):
     """Push morning go-list to Google Sheets. Skips duplicates (same date+symbol)."""
     if not GSHEETS_AVAILABLE:
@@ -284,23 +726,37 @@ def sync_morning_to_sheets(golist_data):
     ensure_sheet_header(ws)
 
     golist   = golist_data.get("golist", [])
-    scan_ts  = golist_data.get("timestamp", datetime.now().isoformat())
-    today    = datetime.now().strftime("%Y-%m-%d")
+    now      = datetime.now()
+    scan_ts  = golist_data.get("timestamp", now.isoformat())   # written to the sheet — full precision
+    today    = now.strftime("%Y-%m-%d")
 
     if not golist:
         return {"error": "No stocks in go-list to sync"}
 
-    # Fetch all existing rows to check for duplicates
-    try:
-        existing_rows = ws.get_all_values()
-        # Build set of existing date+symbol combos (skip header row)
-        existing_keys = set()
-        for row in existing_rows[1:]:
-            if len(row) >= 2:
-                existing_keys.add(f"{row[0]}_{row[1]}")
-    except Exception as e:
-        print(f"[SHEETS] Read existing error: {e}")
-        existing_keys = set()
+    # Evening scan details for the extra columns — looked up per symbol below
+    ev = load_file(data_path("scan_results.json")) or {}
+    ev_results = {r["symbol"]: r for r in ev.get("results", [])}
+
+    # Duplicates are checked against a local index of today's date_symbol keys; the sheet itself
+    # (Date/Symbol columns only, header skipped) is read just when there's no index for this sheet
+    sid  = getattr(getattr(ws, "spreadsheet", None), "id", None)
+    seen = load_file(data_path(JOURNAL_SEEN_FILE)) or {}
+    if sid and seen.get("sheet") == sid:
+        existing_keys = {k for k in seen.get("keys", []) if k.startswith(f"{today}_")}
+        index_stale   = False
+        read_failed   = False
+    else:
+        index_stale = True
+        read_failed = False
+        try:
+            existing_keys = set()
+            for row in ws.get("A2:B"):
+                if len(row) >= 2 and row[0] == today:
+                    existing_keys.add(f"{row[0]}_{row[1]}")
+        except Exception as e:
+            print(f"[SHEETS] Read existing error: {e}")
+            existing_keys = set()
+            read_failed   = True   # never persist an index built from a failed read
 
     rows_to_add = []
     skipped = 0
@@ -314,8 +770,6 @@ def sync_morning_to_sheets(golist_data):
             continue
 
         tl = s.get("trade_levels") or {}
-        ev = load_file(data_path("scan_results.json")) or {}
-        ev_results = {r["symbol"]: r for r in ev.get("results", [])}
         ev_data = ev_results.get(sym, {})
 
         row = [
@@ -351,8 +805,11 @@ def sync_morning_to_sheets(golist_data):
 
     if rows_to_add:
         # Batch append all new rows at once
-        ws.append_rows(rows_to_add, value_input_option="USER_ENTERED")
+        ws.append_rows(rows_to_add, value_input_option="USER_ENTERED", insert_data_option="INSERT_ROWS")
         print(f"[SHEETS] Appended {len(rows_to_add)} rows, skipped {skipped} duplicates")
+        existing_keys.update(f"{today}_{row[1]}" for row in rows_to_add)
+    if sid and not read_failed and (rows_to_add or index_stale):
+        save_file(data_path(JOURNAL_SEEN_FILE), {"sheet": sid, "keys": sorted(existing_keys)}, pretty=False)
 
     # Get the sheet URL for the response
     try:
@@ -372,28 +829,56 @@ def sync_morning_to_sheets(golist_data):
 
 # ── BACKGROUND TASKS ─────────────────────────────────────────────────────────
 
+DAILY_STATS_FILE = "daily_stats.json"
+
+def refresh_daily_stats(scan):
+    """After the evening scan: previous close and 60-day average volume per result symbol,
+    so the next premarket ranker doesn't re-download 60 daily bars on every load.
+    Each entry records the NY session its close belongs to; today's bar only counts after 16:00 ET."""
+    try:
+        symbols = [r["symbol"] for r in (scan or {}).get("results", [])]
+        if not symbols:
+            return
+        ny    = datetime.now(NY_TZ)
+        upto  = ny.date() + timedelta(days=1) if ny.hour >= 16 else ny.date()
+        stats = {}
+        for sym, df in fetch_histories(symbols, period="60d", interval="1d").items():
+            st = _daily_stats(df, upto)
+            if st:
+                stats[sym] = st
+        save_file(data_path(DAILY_STATS_FILE), {"date": ny.date().isoformat(), "stats": stats}, pretty=False)
+        print(f"[STATS] Daily stats saved for {len(stats)} symbols")
+    except Exception as e:
+        print(f"[STATS] Daily stats error: {e}")
+
+def load_daily_stats(session):
+    """Symbol -> daily stats whose close is from `session` (the previous NY trading day); older
+    entries are dropped so a missed evening scan falls back to fresh daily bars."""
+    doc  = load_file(data_path(DAILY_STATS_FILE)) or {}
+    want = session.isoformat()
+    return {sym: st for sym, st in doc.get("stats", {}).items() if st.get("session") == want}
+
 def run_scan_background():
-    global latest_results, scan_status
+    global latest_results
     try:
-        scan_status["running"] = True
-        scan_status["error"] = None
-        latest_results = run_scanner()
+        set_status(running=True, error=None)
+        latest_results = run_in_process(run_scanner)
+        refresh_daily_stats(latest_results)
         if latest_results and (os.environ.get("GOOGLE_CREDENTIALS_JSON") or os.path.exists("google_credentials.json")):
             try:
                 save_scan_to_sheets(latest_results)
             except Exception as se:
                 print(f"[SHEETS] Evening persistence save error: {se}")
     except Exception as e:
-        scan_status["error"] = str(e)
+        set_status(error=str(e))
         print(f"Background scan error: {e}")
     finally:
-        scan_status["running"] = False
+        set_status(running=False)
 
 def run_morning_background():
-    global latest_morning, latest_results, scan_status
+    global latest_morning, latest_results
     try:
-        scan_status["running"] = True
-        scan_status["error"] = None
+        set_status(running=True, error=None)
         # Ensure evening scan results exist before running morning scan
         if not load_file(data_path("scan_results.json")):
             print("[MORNING] scan_results.json missing — attempting restore from Sheets...")
@@ -403,7 +888,7 @@ def run_morning_background():
                 latest_results = restored
             else:
                 print("[MORNING] No evening scan data found — morning scan may return empty list")
-        latest_morning = run_morning_scan()
+        latest_morning = run_in_process(run_morning_scan)
         # Auto-sync to Google Sheets if configured (admin feature)
         if latest_morning and os.environ.get("GOOGLE_CREDENTIALS_JSON") or os.path.exists("google_credentials.json"):
             try:
@@ -415,54 +900,74 @@ def run_morning_background():
             except Exception as se:
                 print(f"[SHEETS] Auto-sync error: {se}")
     except Exception as e:
-        scan_status["error"] = str(e)
+        set_status(error=str(e))
     finally:
-        scan_status["running"] = False
+        set_status(running=False)
 
 def run_backtest_background():
-    global scan_status
     try:
-        scan_status["running"] = True
-        scan_status["error"] = None
-        run_backtest()
+        set_status(running=True, error=None)
+        run_in_process(run_backtest)
     except Exception as e:
-        scan_status["error"] = str(e)
+        set_status(error=str(e))
     finally:
-        scan_status["running"] = False
+        set_status(running=False)
 
 # ── SCHEDULER ────────────────────────────────────────────────────────────────
 
 def scheduled_evening():
     global latest_results
     print(f"[SCHEDULER] Evening scan at {datetime.now()}")
-    latest_results = run_scanner()
+    latest_results = run_in_process(run_scanner)
+    refresh_daily_stats(latest_results)
 
 def scheduled_morning():
     global latest_morning
     print(f"[SCHEDULER] Morning scan at {datetime.now()}")
-    latest_morning = run_morning_scan()
+    latest_morning = run_in_process(run_morning_scan)
 
 def scheduled_eod_save():
     """Auto-save EOD results at 4:15pm ET and append to history."""
     print(f"[SCHEDULER] Auto EOD save at {datetime.now()}")
     try:
         eod = load_file(data_path("eod_results.json"))
-        if eod and eod.get("date") == datetime.now().strftime("%Y-%m-%d"):
-            history = load_file(data_path("eod_history.json")) or []
-            # Avoid duplicate dates
-            history = [h for h in history if h.get("date") != eod["date"]]
-            history.append(eod)
-            history = history[-60:]  # keep 60 days
-            save_file(data_path("eod_history.json"), history)
+        if eod and eod.get("date") == _now_strs()[1]:
+            append_history(eod)   # same-date entries are superseded on read
             print("[SCHEDULER] EOD history saved")
     except Exception as e:
         print(f"[SCHEDULER] EOD save error: {e}")
 
-scheduler = BackgroundScheduler()
-scheduler.add_job(scheduled_evening,  'cron', day_of_week='mon-fri', hour=18, minute=0)
-scheduler.add_job(scheduled_morning,  'cron', day_of_week='mon-fri', hour=9,  minute=0)
-scheduler.add_job(scheduled_eod_save, 'cron', day_of_week='mon-fri', hour=16, minute=15)
-scheduler.start()
+SCHED_LOCK_PATH = os.environ.get('SCHEDULER_LOCK', '/tmp/dayedge_sched.lock')
+_sched_lock     = None   # held open for the life of the process that owns the scheduler
+
+def acquire_scheduler_lock():
+    """Only one process per host gets the lock — the rest of the gunicorn workers skip the scheduler."""
+    global _sched_lock
+    try:
+        import fcntl
+    except ImportError:
+        return True   # no flock on this platform — fall back to always starting
+    try:
+        f = open(SCHED_LOCK_PATH, 'w')
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    _sched_lock = f
+    return True
+
+# Fixed job ids so a re-import replaces jobs instead of stacking duplicates.
+# Set SCHEDULER_WORKER=0 on extra replicas so only one process runs the cron jobs.
+# An hour of grace: a run delayed by a busy executor or a suspended/overloaded host still fires once (coalesced)
+scheduler = BackgroundScheduler(job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 3600})
+scheduler.add_job(scheduled_evening,  'cron', day_of_week='mon-fri', hour=18, minute=0,  id='evening',  replace_existing=True)
+scheduler.add_job(scheduled_morning,  'cron', day_of_week='mon-fri', hour=9,  minute=0,  id='morning',  replace_existing=True)
+scheduler.add_job(scheduled_eod_save, 'cron', day_of_week='mon-fri', hour=16, minute=15, id='eod_save', replace_existing=True)
+if os.environ.get('SCHEDULER_WORKER', '1') != '1':
+    print("[SCHEDULER] SCHEDULER_WORKER != 1 — cron jobs disabled in this process")
+elif not acquire_scheduler_lock():
+    print(f"[SCHEDULER] {SCHED_LOCK_PATH} held by another worker — cron jobs disabled in this process")
+else:
+    scheduler.start()
 
 # ── CORE ROUTES ───────────────────────────────────────────────────────────────
 
@@ -483,7 +988,7 @@ def do_login():
     print(f"[LOGIN] Attempt: username={username!r}")
 
     if not username or not password:
-        return jsonify({'error': 'Username and password required'}), 400
+        return ojsonify({'error': 'Username and password required'}), 400
 
     users    = get_users()
     user     = users.get(username)
@@ -491,11 +996,12 @@ def do_login():
 
     print(f"[LOGIN] Known users: {list(users.keys())}")
     print(f"[LOGIN] User found: {user is not None}")
+    match = bool(user) and hmac.compare_digest(user['password_hash'], pw_hash)
     if user:
-        print(f"[LOGIN] Hash match: {user['password_hash'] == pw_hash}")
+        print(f"[LOGIN] Hash match: {match}")
 
-    if not user or user['password_hash'] != pw_hash:
-        return jsonify({'error': 'Invalid username or password'}), 401
+    if not match:
+        return ojsonify({'error': 'Invalid username or password'}), 401
 
     # Set session
     session.clear()
@@ -505,7 +1011,7 @@ def do_login():
 
     print(f"[LOGIN] Success: {username} role={user['role']} session_id={request.cookies.get('dayedge_session','none')}")
 
-    return jsonify({
+    return ojsonify({
         'ok':       True,
         'username': username,
         'role':     user['role'],
@@ -517,28 +1023,52 @@ def do_logout():
     session.clear()
     if request.method == 'GET':
         return redirect('/login')
-    return jsonify({'ok': True})
+    return ojsonify({'ok': True})
 
 @app.route('/api/me')
 def me():
     if 'username' not in session:
-        return jsonify({'authenticated': False}), 401
-    return jsonify({
+        return ojsonify({'authenticated': False}), 401
+    return ojsonify({
         'authenticated': True,
         'username': session['username'],
         'role':     session['role'],
         'access':   ROLE_ACCESS[session['role']]
     })
 
+INDEX_PATH  = os.path.join(app.root_path, 'static', 'index.html')
+_INDEX_HTML = None   # (mtime_ns, bytes, etag) — read once, re-read only in debug when the file changes
+
+def index_html():
+    global _INDEX_HTML
+    if _INDEX_HTML is None or app.debug:
+        mtime = os.stat(INDEX_PATH).st_mtime_ns
+        if _INDEX_HTML is None or _INDEX_HTML[0] != mtime:
+            with open(INDEX_PATH, 'rb') as f:
+                body = f.read()
+            _INDEX_HTML = (mtime, body, hashlib.blake2b(body, digest_size=8).hexdigest())
+    return _INDEX_HTML
+
 @app.route('/')
 @login_required
 def index():
-    return send_from_directory('static', 'index.html')
+    # Conditional response — browsers revalidate and get a 304 until index.html changes
+    mtime, body, etag = index_html()
+    resp = Response(body, mimetype='text/html')
+    resp.set_etag(etag)
+    resp.last_modified = mtime // 1_000_000_000
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
 
 @app.route('/api/scan')
 @login_required
 def get_scan():
     global latest_results
+    raw = load_raw(data_path("scan_results.json"))
+    if raw:
+        if latest_results is None:
+            latest_results = load_file(data_path("scan_results.json"))
+        return raw_json_response(raw)
     if latest_results is None:
         latest_results = load_file(data_path("scan_results.json"))
     if latest_results is None:
@@ -549,67 +1079,75 @@ def get_scan():
         except Exception as _e:
             print(f"[STARTUP] Restore failed: {_e}")
     if latest_results is None:
-        return jsonify({"error": "No scan results yet. Click Run Scan Now.", "results": []})
-    return jsonify(make_serializable(latest_results))
+        return ojsonify({"error": "No scan results yet. Click Run Scan Now.", "results": []})
+    return ojsonify(latest_results)
 
 @app.route('/api/morning')
 @login_required
 def get_morning():
     global latest_morning
+    raw = load_raw(data_path("morning_golist.json"))
+    if raw:
+        if latest_morning is None:
+            latest_morning = load_file(data_path("morning_golist.json"))
+        return raw_json_response(raw)
     if latest_morning is None:
         latest_morning = load_file(data_path("morning_golist.json"))
     if latest_morning is None:
-        return jsonify({"golist": [], "message": "No morning scan yet."})
-    return jsonify(make_serializable(latest_morning))
+        return ojsonify({"golist": [], "message": "No morning scan yet."})
+    return ojsonify(latest_morning)
 
 @app.route('/api/backtest')
 @login_required
 def get_backtest():
-    data = load_file(data_path("backtest_results.json"))
-    if data is None:
-        return jsonify({"error": "No backtest run yet."})
-    return jsonify(make_serializable(data))
+    raw = load_raw(data_path("backtest_results.json"))
+    if raw is None:
+        return ojsonify({"error": "No backtest run yet."})
+    return raw_json_response(raw)
+
+def task_running():
+    return get_status().running or (_CURRENT_FUTURE is not None and not _CURRENT_FUTURE.done())
 
 @app.route('/api/scan-status')
 @login_required
 def get_scan_status():
-    return jsonify({
-        "running":     scan_status["running"],
-        "task":        scan_status["task"],
-        "error":       scan_status["error"],
+    snap = get_status()
+    return ojsonify({
+        "running":     task_running(),
+        "task":        snap.task,
+        "error":       snap.error,
         "has_results": latest_results is not None
     })
 
 @app.route('/api/run-scan', methods=['POST'])
 @login_required
 def trigger_scan():
-    global scan_status
-    if scan_status["running"]:
-        return jsonify({"status": "already_running"})
-    scan_status["task"] = "evening"
-    scan_status["started"] = datetime.now().isoformat()
-    threading.Thread(target=run_scan_background, daemon=True).start()
-    return jsonify({"status": "started"})
+    global _CURRENT_FUTURE
+    if task_running():
+        return ojsonify({"status": "already_running"})
+    set_status(task="evening", started=datetime.now().isoformat())
+    _CURRENT_FUTURE = _EXECUTOR.submit(run_scan_background)
+    return ojsonify({"status": "started"})
 
 @app.route('/api/run-morning', methods=['POST'])
 @login_required
 def trigger_morning():
-    global scan_status
-    if scan_status["running"]:
-        return jsonify({"status": "already_running"})
-    scan_status["task"] = "morning"
-    threading.Thread(target=run_morning_background, daemon=True).start()
-    return jsonify({"status": "started"})
+    global _CURRENT_FUTURE
+    if task_running():
+        return ojsonify({"status": "already_running"})
+    set_status(task="morning")
+    _CURRENT_FUTURE = _EXECUTOR.submit(run_morning_background)
+    return ojsonify({"status": "started"})
 
 @app.route('/api/run-backtest', methods=['POST'])
 @login_required
 def trigger_backtest():
-    global scan_status
-    if scan_status["running"]:
-        return jsonify({"status": "already_running"})
-    scan_status["task"] = "backtest"
-    threading.Thread(target=run_backtest_background, daemon=True).start()
-    return jsonify({"status": "started"})
+    global _CURRENT_FUTURE
+    if task_running():
+        return ojsonify({"status": "already_running"})
+    set_status(task="backtest")
+    _CURRENT_FUTURE = _EXECUTOR.submit(run_backtest_background)
+    return ojsonify({"status": "started"})
 
 # ── FEATURE 1: LIVE INTRADAY TRACKER ─────────────────────────────────────────
 
@@ -619,7 +1157,14 @@ def live_tracker():
     """Real-time prices for morning go-list. Shows P&L vs entry and target zones."""
     morning = load_file(data_path("morning_golist.json"))
     if not morning or not morning.get("golist"):
-        return jsonify({"error": "No morning go-list. Run morning scan first.", "stocks": []})
+        return ojsonify({"error": "No morning go-list. Run morning scan first.", "stocks": []})
+
+    # Two batched downloads (regular session + extended hours) for the whole go-list, run side by side
+    symbols = [s["symbol"] for s in morning["golist"]
+               if s.get("trade_levels", {}).get("entry") or s.get("prev_close")]
+    bars_f   = _IO_POOL.submit(fetch_histories, symbols, period="1d", interval="5m")
+    ext_bars = fetch_histories(symbols, period="1d", interval="5m", prepost=True)
+    bars     = bars_f.result()
 
     stocks = []
     for s in morning["golist"]:
@@ -628,15 +1173,16 @@ def live_tracker():
         if not entry:
             continue
         try:
-            ticker = yf.Ticker(sym)
-            df = ticker.history(period="1d", interval="5m")
+            df = bars.get(sym)
             if df is None or len(df) == 0:
                 continue
 
-            price     = round(float(df['Close'].iloc[-1]), 2)
-            day_high  = round(float(df['High'].max()), 2)
-            day_low   = round(float(df['Low'].min()), 2)
-            day_vol   = int(df['Volume'].sum())
+            # One float64 copy of the bars; every aggregate below reads columns of it
+            arr       = df[HLCV].to_numpy(dtype=np.float64)
+            price     = round(float(arr[-1, 2]), 2)
+            day_high  = round(float(np.nanmax(arr[:, 0])), 2)
+            day_low   = round(float(np.nanmin(arr[:, 1])), 2)
+            day_vol   = int(np.nansum(arr[:, 3]))
             pnl_pct   = round(((price - entry) / entry) * 100, 2)
             pnl_dollar = round(price - entry, 2)
 
@@ -661,10 +1207,7 @@ def live_tracker():
                 zone = "BELOW_ENTRY"
 
             # Pullback signal: price within 0.5% of VWAP (approx from typical price)
-            typical = df[['High','Low','Close']].mean(axis=1)
-            cum_tp_vol = (typical * df['Volume']).cumsum()
-            cum_vol = df['Volume'].cumsum()
-            vwap = round(float((cum_tp_vol / cum_vol).iloc[-1]), 2)
+            vwap = round(session_vwap(arr), 2)
 
             pullback_signal = abs(price - vwap) / vwap < 0.005
 
@@ -674,7 +1217,7 @@ def live_tracker():
             # Pre-market high — highest price before 9:30am ET
             pm_high = None
             try:
-                pm_df = ticker.history(period="1d", interval="5m", prepost=True)
+                pm_df = ext_bars.get(sym)
                 if pm_df is not None and len(pm_df) > 0:
                     pm_bars = pm_df[pm_df.index.hour < 9]
                     if not pm_bars.empty:
@@ -686,8 +1229,8 @@ def live_tracker():
             first_candle_above_vwap = False
             first_candle_close = None
             try:
-                if len(df) >= 1:
-                    first_candle_close = round(float(df['Close'].iloc[0]), 2)
+                if len(arr) >= 1:
+                    first_candle_close = round(float(arr[0, 2]), 2)
                     first_candle_above_vwap = first_candle_close > vwap
             except:
                 pass
@@ -724,8 +1267,8 @@ def live_tracker():
             print(f"Live tracker error {sym}: {e}")
             continue
 
-    stocks.sort(key=lambda x: x["pnl_pct"], reverse=True)
-    return jsonify({"stocks": stocks, "timestamp": datetime.now().isoformat()})
+    stocks.sort(key=itemgetter("pnl_pct"), reverse=True)
+    return ojsonify({"stocks": stocks, "timestamp": _now_strs()[0]})
 
 # ── FEATURE 2 & 3: ENTRY TIMING + PRE-MARKET MOMENTUM ────────────────────────
 
@@ -735,38 +1278,55 @@ def premarket_momentum():
     """Pre-market momentum ranker — volume surge and price acceleration."""
     morning = load_file(data_path("morning_golist.json"))
     golist  = (morning or {}).get("golist", [])
+    golist_map = {}
+    for s in golist:
+        golist_map.setdefault(s["symbol"], s)   # first entry wins, as the old linear lookup did
 
     # Also check evening scan for any high-scorers not in morning list
     evening = load_file(data_path("scan_results.json"))
     evening_results = (evening or {}).get("results", [])
     evening_map = {r["symbol"]: r for r in evening_results}
 
-    symbols = list({s["symbol"] for s in golist})
+    symbols = list(golist_map)
     if not symbols:
-        return jsonify({"error": "No go-list stocks. Run morning scan first.", "stocks": []})
-
-    stocks = []
-    for sym in symbols:
+        return ojsonify({"error": "No go-list stocks. Run morning scan first.", "stocks": []})
+
+    # Batched: pre-market 1m bars for today and 60 days of dailies, one download each.
+    # Dailies are only needed for symbols last night's scan didn't precompute stats for.
+    # Headlines for gap quality are one request per symbol; all of it is in flight at once.
+    pm_day      = datetime.now(NY_TZ).date()
+    daily_stats = load_daily_stats(prev_session(pm_day))
+    daily_f    = _IO_POOL.submit(fetch_histories, [s for s in symbols if s not in daily_stats],
+                                 period="60d", interval="1d")
+    news_it    = _IO_POOL.map(fetch_news, symbols)
+    pm_bars    = fetch_histories(symbols, period="1d", interval="1m", prepost=True)
+    daily_bars = daily_f.result()
+    news_map   = dict(zip(symbols, news_it))
+    save_news_cache()
+
+    def pm_row(sym):
         try:
-            ticker = yf.Ticker(sym)
-            # Pre-market data (1m bars today)
-            df_pm = ticker.history(period="1d", interval="1m", prepost=True)
-            df_60 = ticker.history(period="60d", interval="1d")
+            df_pm  = pm_bars.get(sym)
+            st     = daily_stats.get(sym)
+            if st is None:
+                # Missing from the batch -> no prev close, row still shown
+                st = _daily_stats(daily_bars.get(sym), pm_day) or {"prev_close": None, "avg_daily_vol": 1}
+            prev_close, avg_daily_vol = st["prev_close"], st["avg_daily_vol"]
 
             if df_pm is None or len(df_pm) == 0:
-                continue
-
-            prev_close = round(float(df_60['Close'].iloc[-2]), 2) if len(df_60) >= 2 else None
+                return None
 
-            # Pre-market only rows (before 9:30am)
-            df_pm.index = df_pm.index.tz_convert('America/New_York')
-            pm = df_pm[df_pm.index.hour < 9]
-            last15 = pm.tail(15)
+            # Pre-market only rows (before 9am ET): compare the index against one tz-aware cutoff
+            # (an int64 compare underneath) instead of converting every timestamp to New York time.
+            # Not raw asi8 — its unit follows the index resolution, which isn't always ns.
+            day    = df_pm.index[-1].tz_convert(NY_TZ).normalize()
+            cutoff = day.replace(hour=9)
+            arr = df_pm[HLCV].to_numpy(dtype=np.float64)
+            pm  = arr[df_pm.index < cutoff]
 
-            pm_price  = round(float(df_pm['Close'].iloc[-1]), 2) if len(df_pm) else None
-            pm_vol    = int(pm['Volume'].sum()) if len(pm) else 0
-            last15_vol = int(last15['Volume'].sum()) if len(last15) else 0
-            avg_daily_vol = int(df_60['Volume'].mean()) if len(df_60) else 1
+            pm_price  = round(float(arr[-1, 2]), 2) if len(arr) else None
+            pm_vol    = int(np.nansum(pm[:, 3]))
+            last15_vol = int(np.nansum(pm[-15:, 3]))
 
             pm_pct = round(((pm_price - prev_close) / prev_close) * 100, 2) if prev_close and pm_price else 0
 
@@ -779,19 +1339,21 @@ def premarket_momentum():
 
             # Entry timing signal
             # Good entry: price pulled back from PM high, near VWAP
-            pm_high = round(float(pm['High'].max()), 2) if len(pm) else pm_price
+            pm_high = round(float(np.nanmax(pm[:, 0])), 2) if len(pm) else pm_price
             pullback_from_high = round(((pm_high - pm_price) / pm_high) * 100, 2) if pm_high else 0
             entry_signal = "WAIT" if pm_pct > 5 else "WATCH" if pm_pct > 2 else "WEAK"
             if pullback_from_high > 1 and pm_pct > 2:
                 entry_signal = "PULLBACK — GOOD ENTRY ZONE"
 
             # Gap quality
-            gap_quality = score_gap_quality(sym, pm_pct, ticker)
+            gap_quality = score_gap_quality(sym, pm_pct, news_map.get(sym))
 
-            morning_stock = next((s for s in golist if s["symbol"] == sym), {})
+            morning_stock = golist_map.get(sym, {})
             evening_stock = evening_map.get(sym, {})
 
-            stocks.append({
+            # Rank: high PM%, high acceleration, good gap quality — kept beside the row, not in it
+            rank = pm_vol_ratio + acceleration * 20 + pm_pct * 2
+            return rank, {
                 "symbol":          sym,
                 "grade":           morning_stock.get("grade", evening_stock.get("grade", "C")),
                 "prev_close":      prev_close,
@@ -806,38 +1368,88 @@ def premarket_momentum():
                 "entry_signal":    entry_signal,
                 "gap_quality":     gap_quality,
                 "evening_score":   morning_stock.get("evening_score", evening_stock.get("score", 0)),
-            })
+            }
         except Exception as e:
             print(f"PM momentum error {sym}: {e}")
-            continue
-
-    # Rank: high PM%, high acceleration, good gap quality
-    stocks.sort(key=lambda x: (x["pm_vol_ratio"] + x["acceleration"] * 20 + x["pm_pct"] * 2), reverse=True)
-    return jsonify({"stocks": stocks, "timestamp": datetime.now().isoformat()})
+            return None
 
-def score_gap_quality(sym, gap_pct, ticker_obj):
-    """Feature 6: Score gap by catalyst quality."""
+    ranked = [r for r in map(pm_row, symbols) if r]
+    ranked.sort(key=itemgetter(0), reverse=True)
+    stocks = [row for _, row in ranked]
+    return ojsonify({"stocks": stocks, "timestamp": _now_strs()[0]})
+
+# Catalyst categories in priority order: the first category with any keyword hit wins
+CATALYSTS = [
+    ("EARNINGS", "green",  4, "Earnings catalyst — high conviction",     ["earnings","beat","eps","revenue","quarterly","q1","q2","q3","q4"]),
+    ("UPGRADE",  "green",  3, "Analyst upgrade — strong catalyst",       ["upgrade","overweight","buy rating","price target raised","outperform"]),
+    ("FDA/DRUG", "green",  4, "FDA catalyst — high volatility expected", ["fda","approval","clearance","trial","phase"]),
+    ("DEAL",     "blue",   3, "M&A or deal — sustained move likely",     ["merger","acquisition","deal","partnership","contract","awarded"]),
+    ("GENERAL",  "yellow", 2, "General news — moderate conviction",      ["rises","gains","jumps","surges","rallies"]),
+]
+# One scan for every keyword: a lookahead per position so overlapping hits are all seen,
+# and group i+1 matching means category i (earlier alternatives win at the same position).
+CATALYST_RE = re.compile("(?=" + "|".join(
+    "(%s)" % "|".join(map(re.escape, words)) for *_, words in CATALYSTS) + ")")
+
+def _catalyst(text):
+    """Index into CATALYSTS of the highest-priority keyword hit in `text`, or None."""
+    best = None
+    for m in CATALYST_RE.finditer(text):
+        i = m.lastindex - 1
+        if best is None or i < best:
+            if i == 0:
+                return 0
+            best = i
+    return best
+
+NEWS_TTL        = 600   # headlines change on a scale of minutes
+NEWS_CACHE_FILE = "news_cache.json"
+_NEWS_CACHE     = None    # symbol -> [fetched_at epoch, headlines]; seeded from disk on first use
+_NEWS_DIRTY     = False
+_NEWS_LOCK      = threading.Lock()
+
+def fetch_news(sym):
+    """Ticker headlines (title only, first 5), or None if the lookup failed."""
+    global _NEWS_CACHE, _NEWS_DIRTY
+    if _NEWS_CACHE is None:
+        with _NEWS_LOCK:   # the premarket ranker calls this from several pool threads at once
+            if _NEWS_CACHE is None:
+                _NEWS_CACHE = dict(load_file(data_path(NEWS_CACHE_FILE)) or {})
+    now = time.time()   # wall clock, since entries are shared with other workers through the file
+    hit = _NEWS_CACHE.get(sym)
+    if hit and now - hit[0] < NEWS_TTL:
+        return hit[1]
+    try:
+        news = [{"title": n.get("title", "")} for n in (_ticker(sym).news or [])[:5]]
+    except Exception as e:
+        print(f"News fetch error {sym}: {e}")
+        return None
+    _NEWS_CACHE[sym] = [now, news]
+    _NEWS_DIRTY = True
+    return news
+
+def save_news_cache():
+    """Persist fresh headline entries so restarts and other workers start warm."""
+    global _NEWS_DIRTY
+    if not _NEWS_DIRTY:
+        return
+    _NEWS_DIRTY = False
+    now = time.time()
+    save_file(data_path(NEWS_CACHE_FILE),
+              {sym: hit for sym, hit in list(_NEWS_CACHE.items()) if now - hit[0] < NEWS_TTL}, pretty=False)
+
+def score_gap_quality(sym, gap_pct, news):
+    """Feature 6: Score gap by catalyst quality. `news` is a prefetched headline list (None = fetch failed)."""
+    if news is None:
+        return {"label": "UNKNOWN", "color": "dim", "score": 1, "note": "Could not fetch news"}
     try:
-        news = ticker_obj.news or []
         headlines = " ".join([n.get("title","").lower() for n in news[:5]])
 
-        earnings_kw = ["earnings","beat","eps","revenue","quarterly","q1","q2","q3","q4"]
-        upgrade_kw  = ["upgrade","overweight","buy rating","price target raised","outperform"]
-        fda_kw      = ["fda","approval","clearance","trial","phase"]
-        deal_kw     = ["merger","acquisition","deal","partnership","contract","awarded"]
-        general_kw  = ["rises","gains","jumps","surges","rallies"]
-
-        if any(k in headlines for k in earnings_kw):
-            return {"label": "EARNINGS", "color": "green",  "score": 4, "note": "Earnings catalyst — high conviction"}
-        elif any(k in headlines for k in upgrade_kw):
-            return {"label": "UPGRADE",  "color": "green",  "score": 3, "note": "Analyst upgrade — strong catalyst"}
-        elif any(k in headlines for k in fda_kw):
-            return {"label": "FDA/DRUG", "color": "green",  "score": 4, "note": "FDA catalyst — high volatility expected"}
-        elif any(k in headlines for k in deal_kw):
-            return {"label": "DEAL",     "color": "blue",   "score": 3, "note": "M&A or deal — sustained move likely"}
-        elif any(k in headlines for k in general_kw):
-            return {"label": "GENERAL",  "color": "yellow", "score": 2, "note": "General news — moderate conviction"}
-        elif abs(gap_pct) > 3:
+        i = _catalyst(headlines)
+        if i is not None:
+            label, color, score, note, _ = CATALYSTS[i]
+            return {"label": label, "color": color, "score": score, "note": note}
+        if abs(gap_pct) > 3:
             return {"label": "NO NEWS",  "color": "red",    "score": 1, "note": "Large gap with no clear catalyst — caution"}
         else:
             return {"label": "UNKNOWN",  "color": "dim",    "score": 1, "note": "No clear catalyst found"}
@@ -854,7 +1466,7 @@ def risk_dashboard():
     golist  = (morning or {}).get("golist", [])
 
     if not golist:
-        return jsonify({"error": "No go-list. Run morning scan first.", "stocks": []})
+        return ojsonify({"error": "No go-list. Run morning scan first.", "stocks": []})
 
     # Default account size — user can override via query param
     from flask import request
@@ -905,7 +1517,7 @@ def risk_dashboard():
     total_risk      = round(total_risk_dollar, 2)
     total_risk_pct  = round((total_risk / account) * 100, 1)
 
-    return jsonify({
+    return ojsonify({
         "account":        account,
         "risk_per_trade": risk_per_trade_pct,
         "stocks":         stocks,
@@ -917,18 +1529,31 @@ def risk_dashboard():
             "exposure_pct":    round((total_exposure / account) * 100, 1),
             "warning":         total_risk_pct > 5,
         },
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_strs()[0]
     })
 
 # ── FEATURE 7: SPY LIVE CONDITION ─────────────────────────────────────────────
 
+INDEX_TTL    = 60   # 5m bars only change once per bar; dashboard polls inside that window reuse the read
+_INDEX_CACHE = {}   # symbol -> (fetched_at, condition dict)
+
 @app.route('/api/spy-condition')
 @login_required
 def spy_condition():
     """Live SPY + QQQ trend — green/yellow/red signal for intraday."""
     def get_index_data(symbol):
+        now    = time.monotonic()
+        cached = _INDEX_CACHE.get(symbol)
+        if cached and now - cached[0] < INDEX_TTL:
+            return cached[1]
+        data = index_condition(symbol)
+        if data is None or data["status"] != "unknown":   # retry failures on the next poll
+            _INDEX_CACHE[symbol] = (now, data)
+        return data
+
+    def index_condition(symbol):
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = _ticker(symbol)
             df = ticker.history(period="1d", interval="5m")
             if df is None or len(df) < 5:
                 return None
@@ -944,22 +1569,22 @@ def spy_condition():
 
             market_open = minutes_since_last_bar < 15
 
-            price   = round(float(df['Close'].iloc[-1]), 2)
-            open_   = round(float(df['Open'].iloc[0]),  2)
-            high    = round(float(df['High'].max()), 2)
-            low     = round(float(df['Low'].min()),  2)
+            bars    = df[OHLCV].to_numpy(dtype=np.float64)   # one block for every stat below
+            closes  = bars[:, 3]
+            price   = round(float(closes[-1]), 2)
+            open_   = round(float(bars[0, 0]),  2)
+            high    = round(float(np.nanmax(bars[:, 1])), 2)
+            low     = round(float(np.nanmin(bars[:, 2])), 2)
             change  = round(price - open_, 2)
             chg_pct = round((change / open_) * 100, 2)
 
-            ema9       = float(df['Close'].ewm(span=9).mean().iloc[-1])
+            ema9       = ema_last(closes, 9)
             above_ema9 = price > ema9
 
-            typical    = df[['High','Low','Close']].mean(axis=1)
-            vwap       = float((typical * df['Volume']).cumsum().iloc[-1] / df['Volume'].cumsum().iloc[-1])
+            vwap       = session_vwap(bars[:, 1:])
             above_vwap = price > vwap
 
-            last3       = df['Close'].tail(3).tolist()
-            trending_up = last3[-1] > last3[0]
+            trending_up = bool(closes[-1] > closes[-3])
 
             if not market_open:
                 status  = "closed"
@@ -1009,104 +1634,167 @@ def spy_condition():
         else:
             overall = "neutral"
 
-        return jsonify({
+        return ojsonify({
             "status":    overall,
             "spy":       spy_data,
             "qqq":       qqq_data,
             "message":   f"SPY {spy_status.upper()} · QQQ {qqq_status.upper()}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_strs()[0]
         })
     except Exception as e:
-        return jsonify({"status": "unknown", "message": str(e)})
+        return ojsonify({"status": "unknown", "message": str(e)})
 
 # ── FEATURE 4: EOD RESULTS + PATTERN RECOGNITION ──────────────────────────────
 
+# EOD prices are fetched on _EXECUTOR, never on the request thread; _EOD_LOCK is held while a compute runs
+_EOD_LOCK  = threading.Lock()
+_EOD_ERROR = None   # last background failure, reported once to the next poll
+_EOD_MEMO  = None   # last computed output — served if eod_results.json could not be written
+
 @app.route('/api/eod-results')
 @admin_required
 def get_eod_results():
-    """EOD results with force-refresh support."""
-    from flask import request
+    """EOD results with force-refresh support. Returns {"status": "computing"} while a refresh runs."""
+    global _EOD_ERROR
     force = request.args.get("force", "false").lower() == "true"
-    EOD_FILE = data_path("eod_results.json")
+
+    # Read-and-clear the error under the lock (the compute sets it while holding it),
+    # so concurrent polls report a failure exactly once
+    if not _EOD_LOCK.acquire(blocking=False):
+        return ojsonify({"status": "computing"})
+    try:
+        err, _EOD_ERROR = _EOD_ERROR, None
+    finally:
+        _EOD_LOCK.release()
+    if err:
+        return ojsonify({"error": f"EOD refresh failed: {err}", "results": []})
 
     if not force:
-        cached = load_file(EOD_FILE)
-        if cached and cached.get("date") == datetime.now().strftime("%Y-%m-%d"):
-            return jsonify(cached)
+        today  = _now_strs()[1]
+        cached = load_file(data_path("eod_results.json"))
+        if cached and cached.get("date") == today:
+            return ojsonify(cached)
+        if _EOD_MEMO and _EOD_MEMO.get("date") == today:
+            return ojsonify(_EOD_MEMO)
 
     morning = load_file(data_path("morning_golist.json"))
     if not morning or not morning.get("golist"):
-        return jsonify({"error": "No morning go-list found. Run morning scan first.", "results": []})
+        return ojsonify({"error": "No morning go-list found. Run morning scan first.", "results": []})
 
-    results = []
-    total_pnl = 0
-    wins = losses = 0
+    if _EOD_LOCK.acquire(blocking=False):
+        try:
+            _EXECUTOR.submit(run_eod_background, morning)
+        except Exception:
+            _EOD_LOCK.release()
+            raise
+    return ojsonify({"status": "computing"})
+
+def run_eod_background(morning):
+    global _EOD_ERROR
+    try:
+        compute_eod(morning)
+    except Exception as e:
+        _EOD_ERROR = str(e)   # still holding _EOD_LOCK here
+        print(f"Background EOD error: {e}")
+    finally:
+        _EOD_LOCK.release()
+
+def compute_eod(morning):
+    """Score today's go-list against the closing bars, save eod_results.json and append to history."""
+    global _EOD_MEMO
+    EOD_FILE = data_path("eod_results.json")
 
+    # One batched download for the whole go-list instead of a round-trip per symbol
+    bars = fetch_histories([s["symbol"] for s in morning["golist"]
+                            if (s.get("trade_levels") or {}).get("entry") or s.get("prev_close")],
+                           period="2d", interval="1d")
+
+    # Collect the last bar for every symbol, then score the whole go-list as arrays
+    rows = []
     for stock in morning["golist"]:
         sym   = stock["symbol"]
         entry = (stock.get("trade_levels") or {}).get("entry") or stock.get("prev_close")
         if not entry:
             continue
         try:
-            ticker = yf.Ticker(sym)
-            df = ticker.history(period="2d", interval="1d")
+            df = bars.get(sym)
             if df is None or len(df) < 1:
                 continue
-
-            today_close  = round(float(df['Close'].iloc[-1]), 2)
-            today_open   = round(float(df['Open'].iloc[-1]),  2)
-            today_high   = round(float(df['High'].iloc[-1]),  2)
-            today_low    = round(float(df['Low'].iloc[-1]),   2)
-            today_vol    = int(df['Volume'].iloc[-1])
-            pnl_pct      = round(((today_close - entry) / entry) * 100, 2)
-            pnl_dollar   = round(today_close - entry, 2)
-
-            tl       = stock.get("trade_levels") or {}
-            t1_hit   = bool(tl.get("target1") and today_high >= tl["target1"])
-            t2_hit   = bool(tl.get("target2") and today_high >= tl["target2"])
-            t3_hit   = bool(tl.get("target3") and today_high >= tl["target3"])
-            stop_hit = bool(tl.get("stop")    and today_low  <= tl["stop"])
-
-            outcome = "WIN" if pnl_pct > 0.5 else "LOSS" if pnl_pct < -0.5 else "FLAT"
-            if outcome == "WIN":  wins   += 1
-            if outcome == "LOSS": losses += 1
-            total_pnl += pnl_pct
-
-            results.append({
-                "symbol":       sym,
-                "grade":        stock.get("grade", "C"),
-                "sector":       stock.get("sector_etf", ""),
-                "entry":        round(float(entry), 2),
-                "close":        today_close,
-                "open":         today_open,
-                "high":         today_high,
-                "low":          today_low,
-                "volume":       today_vol,
-                "pnl_pct":      pnl_pct,
-                "pnl_dollar":   pnl_dollar,
-                "outcome":      outcome,
-                "t1_hit":       t1_hit,
-                "t2_hit":       t2_hit,
-                "t3_hit":       t3_hit,
-                "stop_hit":     stop_hit,
-                "target1":      tl.get("target1"),
-                "target2":      tl.get("target2"),
-                "target3":      tl.get("target3"),
-                "stop":         tl.get("stop"),
-                "pm_change":    stock.get("pm_change", 0),
-                "evening_score": stock.get("evening_score", 0),
-                "rvol":         stock.get("rvol", 0),
-                "gap_pct":      stock.get("gap_pct", 0),
-            })
+            o, h, l, c, v = df[OHLCV].to_numpy(dtype=np.float64)[-1].tolist()
+            rows.append((stock, float(entry), o, h, l, c, int(v)))
         except Exception as e:
             print(f"EOD error {sym}: {e}")
 
-    results.sort(key=lambda x: x["pnl_pct"], reverse=True)
+    # Load trade log so we know which the user actually traded
+    trade_log      = load_trade_log()
+    # One clock read for the result loop and the saved snapshot; full isoformat since it's persisted
+    now   = datetime.now()
+    today = now.strftime("%Y-%m-%d")
+
+    results = []
+    wins = losses = total_pnl = 0
+    traded_count = tw = tl_count = t_avg = 0
+    if rows:
+        # Missing/zero levels become NaN so their comparisons come out False
+        lv = lambda r, k: float((r[0].get("trade_levels") or {}).get(k) or np.nan)
+        entries = np.array([r[1] for r in rows])
+        opens   = np.round(np.array([r[2] for r in rows]), 2)
+        highs   = np.round(np.array([r[3] for r in rows]), 2)
+        lows    = np.round(np.array([r[4] for r in rows]), 2)
+        closes  = np.round(np.array([r[5] for r in rows]), 2)
+        t1      = np.array([lv(r, "target1") for r in rows])
+        t2      = np.array([lv(r, "target2") for r in rows])
+        t3      = np.array([lv(r, "target3") for r in rows])
+        stops   = np.array([lv(r, "stop")    for r in rows])
+
+        pnl_pct    = np.round((closes - entries) / entries * 100, 2)
+        pnl_dollar = np.round(closes - entries, 2)
+        outcomes   = np.where(pnl_pct > 0.5, "WIN", np.where(pnl_pct < -0.5, "LOSS", "FLAT"))
+        wins       = int((outcomes == "WIN").sum())
+        losses     = int((outcomes == "LOSS").sum())
+        total_pnl  = float(pnl_pct.sum())
+
+        # Traded-only aggregates: the same reductions under a boolean mask
+        traded       = np.array([trade_log.get(f"{today}_{r[0]['symbol']}", {}).get("traded") is True for r in rows])
+        traded_count = int(traded.sum())
+        tw           = int((outcomes[traded] == "WIN").sum())
+        tl_count     = int((outcomes[traded] == "LOSS").sum())
+        t_avg        = round(float(pnl_pct[traded].mean()), 2) if traded_count else 0
+
+        cols = zip(rows, np.round(entries, 2).tolist(), closes.tolist(), opens.tolist(),
+                   highs.tolist(), lows.tolist(), pnl_pct.tolist(), pnl_dollar.tolist(),
+                   outcomes.tolist(), (highs >= t1).tolist(), (highs >= t2).tolist(),
+                   (highs >= t3).tolist(), (lows <= stops).tolist())
+        results = [{
+            "symbol":       stock["symbol"],
+            "grade":        stock.get("grade", "C"),
+            "sector":       stock.get("sector_etf", ""),
+            "entry":        entry,
+            "close":        close,
+            "open":         open_,
+            "high":         high,
+            "low":          low,
+            "volume":       vol,
+            "pnl_pct":      pct,
+            "pnl_dollar":   dollar,
+            "outcome":      outcome,
+            "t1_hit":       h1,
+            "t2_hit":       h2,
+            "t3_hit":       h3,
+            "stop_hit":     sh,
+            "target1":      (stock.get("trade_levels") or {}).get("target1"),
+            "target2":      (stock.get("trade_levels") or {}).get("target2"),
+            "target3":      (stock.get("trade_levels") or {}).get("target3"),
+            "stop":         (stock.get("trade_levels") or {}).get("stop"),
+            "pm_change":    stock.get("pm_change", 0),
+            "evening_score": stock.get("evening_score", 0),
+            "rvol":         stock.get("rvol", 0),
+            "gap_pct":      stock.get("gap_pct", 0),
+        } for (stock, *_, vol), entry, close, open_, high, low, pct, dollar, outcome, h1, h2, h3, sh in cols]
+
+    results.sort(key=itemgetter("pnl_pct"), reverse=True)
     avg_pnl = round(total_pnl / len(results), 2) if results else 0
 
-    # Load trade log so we know which the user actually traded
-    trade_log = load_trade_log()
-    today = datetime.now().strftime("%Y-%m-%d")
     for r in results:
         key = f"{today}_{r['symbol']}"
         log_entry = trade_log.get(key, {})
@@ -1114,15 +1802,9 @@ def get_eod_results():
         r["actual_shares"] = log_entry.get("shares", 0)
         r["actual_entry"]  = log_entry.get("entry", 0)
 
-    # Separate traded vs not-traded for summary
-    traded_results = [r for r in results if r.get("traded") is True]
-    tw = sum(1 for r in traded_results if r.get("outcome") == "WIN")
-    tl_count = sum(1 for r in traded_results if r.get("outcome") == "LOSS")
-    t_avg = round(sum(r["pnl_pct"] for r in traded_results) / len(traded_results), 2) if traded_results else 0
-
     output = {
-        "date":      datetime.now().strftime("%Y-%m-%d"),
-        "timestamp": datetime.now().isoformat(),
+        "date":      today,
+        "timestamp": now.isoformat(),
         "results":   results,
         "summary": {
             "total":     len(results),
@@ -1133,32 +1815,29 @@ def get_eod_results():
             "avg_pnl":   avg_pnl,
             "total_pnl": round(total_pnl, 2),
             # Traded-only summary
-            "traded_count":   len(traded_results),
+            "traded_count":   traded_count,
             "traded_wins":    tw,
             "traded_losses":  tl_count,
-            "traded_win_rate": round((tw / len(traded_results)) * 100, 1) if traded_results else 0,
+            "traded_win_rate": round((tw / traded_count) * 100, 1) if traded_count else 0,
             "traded_avg_pnl": t_avg,
         }
     }
-    save_file(EOD_FILE, output)
+    if not save_file(EOD_FILE, output, pretty=False):
+        # Keep today's result in RAM so polls don't re-fetch every symbol while the disk is failing
+        _EOD_MEMO = output
 
     # ── Auto-save to history every time EOD is refreshed ──────────────────
     try:
-        history = load_file(data_path("eod_history.json")) or []
-        history = [h for h in history if h.get("date") != output["date"]]
-        history.append(output)
-        history = sorted(history, key=lambda x: x.get("date",""))[-60:]
-        save_file(data_path("eod_history.json"), history)
+        append_history(output)
     except Exception as e:
         print(f"History auto-save error: {e}")
 
-    return jsonify(output)
+    return output
 
 @app.route('/api/eod-history')
 @admin_required
 def get_eod_history():
-    history = load_file(data_path("eod_history.json")) or []
-    return jsonify(history)
+    return ojsonify(load_history())
 
 @app.route('/api/save-eod-history', methods=['POST'])
 @admin_required
@@ -1170,24 +1849,20 @@ def save_eod_history():
     try:
         eod = load_file(data_path("eod_results.json"))
         if not eod:
-            return jsonify({"error": "No EOD results to save. Refresh EOD Results first."}), 400
-
-        history = load_file(data_path("eod_history.json")) or []
-        # Replace existing entry for same date (idempotent)
-        history = [h for h in history if h.get("date") != eod.get("date")]
-        history.append(eod)
-        history = sorted(history, key=lambda x: x.get("date",""))[-60:]  # keep last 60 days
-        save_file(data_path("eod_history.json"), history)
-        return jsonify({"ok": True, "days_in_history": len(history), "date": eod.get("date")})
+            return ojsonify({"error": "No EOD results to save. Refresh EOD Results first."}), 400
+
+        # Replaces any existing entry for the same date (idempotent)
+        days = append_history(eod)
+        return ojsonify({"ok": True, "days_in_history": days, "date": eod.get("date")})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 # ── TRADE LOG — track which stocks user actually traded ───────────────────────
 
 TRADE_LOG_FILE = data_path("trade_log.json")
 
-def load_trade_log():
-    return load_file(TRADE_LOG_FILE) or {}
+def load_trade_log(mutable=False):
+    return load_file(TRADE_LOG_FILE, mutable) or {}
 
 def save_trade_log(log):
     save_file(TRADE_LOG_FILE, log)
@@ -1196,7 +1871,7 @@ def save_trade_log(log):
 @login_required
 def get_trade_log():
     """Return the full trade log keyed by date+symbol."""
-    return jsonify(load_trade_log())
+    return ojsonify(load_trade_log())
 
 @app.route('/api/trade-log', methods=['POST'])
 @login_required
@@ -1206,17 +1881,18 @@ def update_trade_log():
     """
     from flask import request
     try:
-        body   = request.get_json()
+        body   = request.get_json(silent=True) or {}   # malformed body -> "Symbol required" 400
+        now    = datetime.now()   # stored in the trade log, so keep full isoformat precision
         symbol = body.get("symbol", "").upper().strip()
-        date   = body.get("date", datetime.now().strftime("%Y-%m-%d"))
+        date   = body.get("date", now.strftime("%Y-%m-%d"))
         traded = bool(body.get("traded", True))
         shares = int(body.get("shares", 0))
         entry  = float(body.get("entry", 0))
 
         if not symbol:
-            return jsonify({"error": "Symbol required"}), 400
+            return ojsonify({"error": "Symbol required"}), 400
 
-        log = load_trade_log()
+        log = load_trade_log(mutable=True)
         key = f"{date}_{symbol}"
         log[key] = {
             "symbol":  symbol,
@@ -1224,12 +1900,12 @@ def update_trade_log():
             "traded":  traded,
             "shares":  shares,
             "entry":   entry,
-            "updated": datetime.now().isoformat()
+            "updated": now.isoformat()
         }
         save_trade_log(log)
 
         # Also update eod_results.json so EOD tab reflects traded status
-        eod = load_file(data_path("eod_results.json"))
+        eod = load_file(data_path("eod_results.json"), mutable=True)
         if eod and eod.get("date") == date:
             for r in eod.get("results", []):
                 if r["symbol"] == symbol:
@@ -1238,9 +1914,9 @@ def update_trade_log():
                     r["actual_entry"]  = entry if entry > 0 else r.get("entry", 0)
             save_file(data_path("eod_results.json"), eod)
 
-        return jsonify({"ok": True, "key": key, "traded": traded})
+        return ojsonify({"ok": True, "key": key, "traded": traded})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 # ── FEATURE 4 cont: PATTERN RECOGNITION ──────────────────────────────────────
 
@@ -1248,117 +1924,103 @@ def update_trade_log():
 @admin_required
 def get_patterns():
     """Analyze EOD history to find YOUR personal edge patterns."""
-    history = load_file(data_path("eod_history.json")) or []
+    history = load_history()
     if len(history) < 3:
-        return jsonify({"error": "Need at least 3 days of EOD history for pattern analysis.", "patterns": []})
+        return ojsonify({"error": "Need at least 3 days of EOD history for pattern analysis.", "patterns": []})
 
-    all_trades = []
+    # One pass over history: every trade is folded into its grade/day/RVOL/gap bucket's
+    # running [count, wins, pnl_sum], so no per-bucket trade lists are kept
+    buckets = {("grade", g): [0, 0, 0.0] for g in PATTERN_GRADES}
+    buckets.update({("day", d): [0, 0, 0.0] for d in range(len(PATTERN_DAYS))})
+    buckets.update({("rvol", b[0]): [0, 0, 0.0] for b in RVOL_BUCKETS})
+    buckets.update({("gap", b[0]): [0, 0, 0.0] for b in GAP_BUCKETS})
+
+    total_trades = 0
     for day in history:
+        dow = _dow(day.get("date", ""))   # parsed once per day, not once per trade per bucket
         for r in day.get("results", []):
             # Only count trades the user actually made (traded=True)
             # If traded is None (never set), include it anyway for backwards compat
             if r.get("traded") is False:
                 continue
-            r["date"] = day.get("date", "")
-            all_trades.append(r)
-
-    if not all_trades:
-        return jsonify({"error": "No trades in history yet.", "patterns": []})
+            total_trades += 1
+            win = r.get("outcome") == "WIN"
+            pnl = r.get("pnl_pct", 0)
+            for key in (("grade", r.get("grade")), ("day", dow),
+                        ("rvol", _range_bucket(r.get("rvol", 0), RVOL_BUCKETS)),
+                        ("gap",  _range_bucket(abs(r.get("gap_pct", 0)), GAP_BUCKETS))):
+                acc = buckets.get(key)
+                if acc is not None:
+                    acc[0] += 1
+                    acc[1] += win
+                    acc[2] += pnl
+
+    if not total_trades:
+        return ojsonify({"error": "No trades in history yet.", "patterns": []})
 
     patterns = []
-
-    # ── By Grade ──
-    for grade in ["A", "B", "C"]:
-        trades = [t for t in all_trades if t.get("grade") == grade]
-        if len(trades) >= 3:
-            wr, avg = _win_stats(trades)
-            patterns.append({
-                "label":      f"Grade {grade} Setups",
-                "type":       "grade",
-                "key":        grade,
-                "count":      len(trades),
-                "win_rate":   wr,
-                "avg_pnl":    avg,
-                "insight":    _insight(wr, avg, f"Grade {grade}"),
-                "color":      "green" if wr > 55 else "red" if wr < 45 else "yellow"
-            })
-
-    # ── By Day of Week ──
-    for dow, name in enumerate(["Monday","Tuesday","Wednesday","Thursday","Friday"]):
-        trades = [t for t in all_trades if _dow(t.get("date","")) == dow]
-        if len(trades) >= 3:
-            wr, avg = _win_stats(trades)
-            patterns.append({
-                "label":    name,
-                "type":     "day",
-                "key":      name,
-                "count":    len(trades),
-                "win_rate": wr,
-                "avg_pnl":  avg,
-                "insight":  _insight(wr, avg, name),
-                "color":    "green" if wr > 55 else "red" if wr < 45 else "yellow"
-            })
-
-    # ── By RVOL bucket ──
-    for label, lo, hi in [("Low RVOL (<1.5x)",0,1.5),("Med RVOL (1.5–3x)",1.5,3),("High RVOL (>3x)",3,99)]:
-        trades = [t for t in all_trades if lo <= t.get("rvol",0) < hi]
-        if len(trades) >= 3:
-            wr, avg = _win_stats(trades)
+    for kind, key, label, (n, wins, pnl_sum) in (
+            [("grade", g, f"Grade {g} Setups", buckets[("grade", g)]) for g in PATTERN_GRADES] +
+            [("day", name, name, buckets[("day", d)]) for d, name in enumerate(PATTERN_DAYS)] +
+            [("rvol", b[0], b[0], buckets[("rvol", b[0])]) for b in RVOL_BUCKETS] +
+            [("gap",  b[0], b[0], buckets[("gap",  b[0])]) for b in GAP_BUCKETS]):
+        if n >= 3:
+            wr, avg = round(wins / n * 100, 1), round(pnl_sum / n, 2)
             patterns.append({
                 "label":    label,
-                "type":     "rvol",
-                "key":      label,
-                "count":    len(trades),
+                "type":     kind,
+                "key":      key,
+                "count":    n,
                 "win_rate": wr,
                 "avg_pnl":  avg,
-                "insight":  _insight(wr, avg, label),
-                "color":    "green" if wr > 55 else "red" if wr < 45 else "yellow"
-            })
-
-    # ── By Gap size ──
-    for label, lo, hi in [("Small Gap (<2%)",0,2),("Ideal Gap (2–8%)",2,8),("Extended Gap (>8%)",8,99)]:
-        trades = [t for t in all_trades if lo <= abs(t.get("gap_pct",0)) < hi]
-        if len(trades) >= 3:
-            wr, avg = _win_stats(trades)
-            patterns.append({
-                "label":    label,
-                "type":     "gap",
-                "key":      label,
-                "count":    len(trades),
-                "win_rate": wr,
-                "avg_pnl":  avg,
-                "insight":  _insight(wr, avg, label),
+                "insight":  _insight(wr, avg, f"Grade {key}" if kind == "grade" else label),
                 "color":    "green" if wr > 55 else "red" if wr < 45 else "yellow"
             })
 
     # Sort by win rate descending
-    patterns.sort(key=lambda x: x["win_rate"], reverse=True)
+    patterns.sort(key=itemgetter("win_rate"), reverse=True)
 
     # Best and worst setups
     best  = [p for p in patterns if p["win_rate"] >= 60][:3]
     worst = [p for p in patterns if p["win_rate"] <= 40][:3]
 
-    return jsonify({
+    return ojsonify({
         "patterns":    patterns,
         "best":        best,
         "worst":       worst,
-        "total_trades": len(all_trades),
+        "total_trades": total_trades,
         "days_tracked": len(history),
-        "timestamp":   datetime.now().isoformat()
+        "timestamp":   _now_strs()[0]
     })
 
-def _win_stats(trades):
-    wins = sum(1 for t in trades if t.get("outcome") == "WIN")
-    wr   = round((wins / len(trades)) * 100, 1)
-    avg  = round(sum(t.get("pnl_pct", 0) for t in trades) / len(trades), 2)
-    return wr, avg
+PATTERN_GRADES = ["A", "B", "C"]
+PATTERN_DAYS   = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+RVOL_BUCKETS   = [("Low RVOL (<1.5x)", 0, 1.5), ("Med RVOL (1.5–3x)", 1.5, 3), ("High RVOL (>3x)", 3, 99)]
+GAP_BUCKETS    = [("Small Gap (<2%)", 0, 2), ("Ideal Gap (2–8%)", 2, 8), ("Extended Gap (>8%)", 8, 99)]
+
+def _range_bucket(val, buckets):
+    for label, lo, hi in buckets:
+        if lo <= val < hi:
+            return label
+    return None
 
+@lru_cache(maxsize=256)
 def _dow(date_str):
+    # Fixed YYYY-MM-DD format — slice it instead of going through strptime
     try:
-        return datetime.strptime(date_str, "%Y-%m-%d").weekday()
-    except:
+        if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
+            return -1
+        return datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:])).weekday()
+    except (TypeError, ValueError):
         return -1
 
+@lru_cache(maxsize=1024)
+def _week_of(date_str):
+    """(monday, friday) of the week containing a YYYY-MM-DD date, as ISO strings."""
+    d      = date.fromisoformat(date_str)
+    monday = d.toordinal() - d.weekday()
+    return date.fromordinal(monday).isoformat(), date.fromordinal(monday + 4).isoformat()
+
 def _insight(wr, avg, label):
     if wr >= 65 and avg > 1:
         return f"Strong edge on {label} — prioritize these setups"
@@ -1373,127 +2035,234 @@ def _insight(wr, avg, label):
 
 # ── FEATURE 8: WEEKLY JOURNAL ─────────────────────────────────────────────────
 
-@app.route('/api/weekly-journal')
-@admin_required
-def weekly_journal():
-    """Auto-generated weekly performance summary from EOD history."""
-    history = load_file(data_path("eod_history.json")) or []
-    if not history:
-        return jsonify({"error": "No history yet. EOD results build up over time.", "weeks": []})
+# (history list, derived value) — load_history() hands back the same list until the file changes
+_WEEKLY_CACHE = (None, b"")
+_WEEKS_CACHE  = (None, {})
 
-    # Group by week
+def _group_by_week(history):
+    """History days grouped by the Monday of their week; regrouped only when the history changes."""
+    global _WEEKS_CACHE
+    cached = _WEEKS_CACHE
+    if cached[0] is history:
+        return cached[1]
     weeks = {}
     for day in history:
+        ds = day.get("date")
+        if not isinstance(ds, str) or len(ds) != 10:
+            continue
         try:
-            d = datetime.strptime(day["date"], "%Y-%m-%d")
-            # Week key = Monday of that week
-            monday = d - timedelta(days=d.weekday())
-            wk = monday.strftime("%Y-%m-%d")
-            if wk not in weeks:
-                weeks[wk] = []
-            weeks[wk].append(day)
-        except:
+            wk = _week_of(ds)[0]   # week key = Monday of that week
+        except ValueError:
             continue
+        if wk not in weeks:
+            weeks[wk] = []
+        weeks[wk].append(day)
+    _WEEKS_CACHE = (history, weeks)
+    return weeks
+
+@dataclass(slots=True)
+class WeekResult:
+    # Field order is the JSON key order — orjson serializes dataclasses natively
+    week_start:   str
+    week_end:     str
+    days_traded:  int
+    total_trades: int
+    wins:         int
+    losses:       int
+    win_rate:     float
+    avg_pnl:      float
+    total_pnl:    float
+    by_grade:     dict
+    top_sectors:  list
+    best_trade:   dict
+    worst_trade:  dict
+    grade:        str
+
+def _build_week(wk_start, days):
+    """WeekResult for one week of EOD days, or None when nothing was traded that week."""
+    # One pass over the week's trades; only count trades the user actually made
+    total = wins = losses = 0
+    pnl_sum = 0
+    best_trade = worst_trade = None
+    grade_counts = {"A": [0, 0], "B": [0, 0], "C": [0, 0]}   # grade -> [count, wins]
+    sectors = Counter()
+    grade_slot = grade_counts.get
+    for d in days:
+        for t in d.get("results", []):
+            get = t.get   # bound once; each trade dict is probed six times below
+            if get("traded") is False:
+                continue
+            total += 1
+            outcome = get("outcome")
+            if outcome == "WIN":
+                wins += 1
+            elif outcome == "LOSS":
+                losses += 1
+            gc = grade_slot(get("grade"))
+            if gc:
+                gc[0] += 1
+                gc[1] += outcome == "WIN"
+            p = get("pnl_pct", 0)
+            pnl_sum += p
+            if best_trade is None or p > best_p:
+                best_trade, best_p = t, p
+            if worst_trade is None or p < worst_p:
+                worst_trade, worst_p = t, p
+            sectors[get("sector", "Unknown") or "Unknown"] += 1
+
+    if not total:
+        return None
 
-    result_weeks = []
-    for wk_start, days in sorted(weeks.items(), reverse=True)[:8]:  # last 8 weeks
-        all_trades = []
-        for d in days:
-            for r in d.get("results", []):
-                # Only count trades the user actually made
-                if r.get("traded") is False:
-                    continue
-                all_trades.append(r)
-
-        if not all_trades:
-            continue
+    wr        = round((wins / total) * 100, 1)
+    avg_pnl   = round(pnl_sum / total, 2)
+    total_pnl = round(pnl_sum, 2)
+
+    # Grade breakdown
+    by_grade = {g: {"count": c, "wins": w, "win_rate": round(w/c*100,1)}
+                for g, (c, w) in grade_counts.items() if c}
+
+    # Most traded sectors
+    top_sectors = sectors.most_common(3)
+
+    wk_end = _week_of(wk_start)[1]
+
+    return WeekResult(
+        week_start   = wk_start,
+        week_end     = wk_end,
+        days_traded  = len(days),
+        total_trades = total,
+        wins         = wins,
+        losses       = losses,
+        win_rate     = wr,
+        avg_pnl      = avg_pnl,
+        total_pnl    = total_pnl,
+        by_grade     = by_grade,
+        top_sectors  = [{"sector": s, "count": c} for s,c in top_sectors],
+        best_trade   = {"symbol": best_trade["symbol"],  "pnl": best_trade["pnl_pct"]},
+        worst_trade  = {"symbol": worst_trade["symbol"], "pnl": worst_trade["pnl_pct"]},
+        grade        = "A" if wr >= 60 and avg_pnl > 1 else "B" if wr >= 50 else "C",
+    )
 
-        wins   = sum(1 for t in all_trades if t.get("outcome") == "WIN")
-        losses = sum(1 for t in all_trades if t.get("outcome") == "LOSS")
-        total  = len(all_trades)
-        wr     = round((wins / total) * 100, 1) if total else 0
-        avg_pnl = round(sum(t.get("pnl_pct",0) for t in all_trades) / total, 2) if total else 0
-        total_pnl = round(sum(t.get("pnl_pct",0) for t in all_trades), 2)
-        best_trade  = max(all_trades, key=lambda t: t.get("pnl_pct",0))
-        worst_trade = min(all_trades, key=lambda t: t.get("pnl_pct",0))
-
-        # Grade breakdown
-        by_grade = {}
-        for g in ["A","B","C"]:
-            gt = [t for t in all_trades if t.get("grade") == g]
-            if gt:
-                gw = sum(1 for t in gt if t.get("outcome") == "WIN")
-                by_grade[g] = {"count": len(gt), "wins": gw, "win_rate": round(gw/len(gt)*100,1)}
-
-        # Most traded sectors
-        sectors = {}
-        for t in all_trades:
-            s = t.get("sector","Unknown") or "Unknown"
-            sectors[s] = sectors.get(s,0) + 1
-        top_sectors = sorted(sectors.items(), key=lambda x: x[1], reverse=True)[:3]
-
-        wk_end = (datetime.strptime(wk_start,"%Y-%m-%d") + timedelta(days=4)).strftime("%Y-%m-%d")
-
-        result_weeks.append({
-            "week_start":  wk_start,
-            "week_end":    wk_end,
-            "days_traded": len(days),
-            "total_trades": total,
-            "wins":        wins,
-            "losses":      losses,
-            "win_rate":    wr,
-            "avg_pnl":     avg_pnl,
-            "total_pnl":   total_pnl,
-            "by_grade":    by_grade,
-            "top_sectors": [{"sector": s, "count": c} for s,c in top_sectors],
-            "best_trade":  {"symbol": best_trade["symbol"],  "pnl": best_trade["pnl_pct"]},
-            "worst_trade": {"symbol": worst_trade["symbol"], "pnl": worst_trade["pnl_pct"]},
-            "grade": "A" if wr >= 60 and avg_pnl > 1 else "B" if wr >= 50 else "C",
-        })
+def _weekly_chunks(weeks):
+    for wk_start, days in heapq.nlargest(8, weeks.items(), key=itemgetter(0)):  # last 8 weeks
+        week = _build_week(wk_start, days)
+        if week is not None:
+            yield orjson.dumps(week, default=str, option=ORJSON_OPTS)
 
-    return jsonify({"weeks": result_weeks, "timestamp": datetime.now().isoformat()})
+@app.route('/api/weekly-journal')
+@admin_required
+def weekly_journal():
+    """Auto-generated weekly performance summary from EOD history."""
+    global _WEEKLY_CACHE
+    history = load_history()
+    if not history:
+        return ojsonify({"error": "No history yet. EOD results build up over time.", "weeks": []})
+    cached = _WEEKLY_CACHE
+    if cached[0] is history:
+        head = cached[1]
+    else:
+        # Encode week by week, so each week's counters are dropped as soon as its JSON is written
+        head = b'{"weeks":[' + b",".join(_weekly_chunks(_group_by_week(history))) + b']'
+        _WEEKLY_CACHE = (history, head)
+    # Only the encoded weeks are cached; the generation time is stamped per response
+    body = head + b',"timestamp":' + orjson.dumps(_now_strs()[0]) + b"}"
+    return Response(body, mimetype='application/json')
 
 # ── EXIT MANAGER QUOTE ────────────────────────────────────────────────────────
 
-@app.route('/api/quote/<symbol>')
-@login_required
-def get_quote(symbol):
+QUOTE_TTL    = 30      # seconds a quote is served from memory before re-fetching
+META_TTL     = 86400   # name / average volume / 52-week range only need refreshing daily
+_QUOTE_CACHE = {}      # symbol -> (fetched_at, payload)
+_META_CACHE  = {}      # symbol -> (fetched_at, (name, avg_volume, high_52w, low_52w))
+
+def _quote_meta(sym, ticker, now):
+    """Slow-moving quote fields; the 1y history and info payload are only fetched on a cache miss."""
+    cached = _META_CACHE.get(sym)
+    if cached and now - cached[0] < META_TTL:
+        return cached[1]
+    ok = True
     try:
-        sym    = symbol.upper().strip()
-        ticker = yf.Ticker(sym)
-        df     = ticker.history(period="60d")
+        yr = ticker.history(period="1y")
+        if yr is None or yr.empty:
+            raise ValueError("empty 1y history")
+        high_52w, low_52w = np.round([yr['High'].max(), yr['Low'].min()], 2).tolist()
+    except Exception as e:
+        print(f"Quote 1y history error {sym}: {e}")
+        high_52w = low_52w = None
+        ok = False
+    try:
+        fi      = ticker.fast_info
+        avg_vol = int(fi.get("ten_day_average_volume") or fi.get("three_month_average_volume") or 0)
+    except Exception as e:
+        print(f"Quote fast_info error {sym}: {e}")
+        avg_vol = 0
+        ok = False
+    try:
+        name = ticker_info(sym, ticker).get("shortName") or sym
+    except Exception as e:
+        print(f"Quote info error {sym}: {e}")
+        name = sym
+        ok = False
+    meta = (name, avg_vol, high_52w, low_52w)
+    if ok:   # don't pin fallback values for a whole day
+        _META_CACHE[sym] = (now, meta)
+    return meta
+
+def quote_data(sym):
+    """(payload, http status) for one symbol; shared by the single and batch quote routes."""
+    try:
+        now    = time.monotonic()
+        cached = _QUOTE_CACHE.get(sym)
+        if cached and now - cached[0] < QUOTE_TTL:
+            return cached[1], 200
+
+        ticker = _ticker(sym)
+        df     = ticker.history(period="10d")   # enough for the 7-bar ATR and the day change
         if df is None or len(df) < 2:
-            return jsonify({"error": f"No data found for {sym}"}), 404
-
-        closes   = df['Close'].tolist()
-        highs    = df['High'].tolist()
-        lows     = df['Low'].tolist()
-        price    = round(float(closes[-1]), 2)
-        prev     = round(float(closes[-2]), 2)
-        change   = round(price - prev, 2)
-        chg_pct  = round(((price - prev) / prev) * 100, 2)
-        atr_vals = [(highs[i] - lows[i]) for i in range(-7, 0)]
-        atr      = round(float(sum(atr_vals) / len(atr_vals)), 2)
-        atr_pct  = round((atr / price) * 100, 2)
-        high_52w = round(float(max(highs)), 2)
-        low_52w  = round(float(min(lows)), 2)
+            return {"error": f"No data found for {sym}"}, 404
 
-        try:
-            info    = ticker.info
-            avg_vol = int(info.get("averageVolume", 0) or 0)
-            name    = info.get("shortName", sym)
-        except:
-            avg_vol = 0
-            name    = sym
+        hlc = df[['High', 'Low', 'Close']].to_numpy(dtype=np.float64)   # one block, sliced below
+        highs, lows, closes = hlc[:, 0], hlc[:, 1], hlc[:, 2]
+        # Round each batch once on the way out instead of per field
+        price, prev, atr = np.round([closes[-1], closes[-2], (highs[-7:] - lows[-7:]).mean()], 2).tolist()
+        change, chg_pct, atr_pct = np.round(
+            [price - prev, (price - prev) / prev * 100, atr / price * 100], 2).tolist()
 
-        return jsonify({
+        name, avg_vol, high_52w, low_52w = _quote_meta(sym, ticker, now)
+        if high_52w is None:   # 1y fetch failed — fall back to the short window's range
+            high_52w, low_52w = np.round([highs.max(), lows.min()], 2).tolist()
+
+        payload = {
             "symbol": sym, "name": name, "price": price,
             "prev_close": prev, "change": change, "change_pct": chg_pct,
             "atr": atr, "atr_pct": atr_pct,
             "high_52w": high_52w, "low_52w": low_52w, "avg_volume": avg_vol,
-        })
+        }
+        _QUOTE_CACHE[sym] = (now, payload)
+        return payload, 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}, 500
+
+@app.route('/api/quote/<symbol>')
+@login_required
+def get_quote(symbol):
+    payload, code = quote_data(symbol.upper().strip())
+    return ojsonify(payload), code
+
+QUOTES_MAX = 25
+
+@app.route('/api/quotes')
+@login_required
+def get_quotes():
+    """Batch quotes for ?symbols=A,B,C — fetched concurrently, so N positions cost about one round-trip."""
+    raw  = (x.strip().upper() for x in request.args.get("symbols", "").split(","))
+    syms = list(dict.fromkeys(s for s in raw if s))   # dedupe, keep request order
+    if not syms:
+        return ojsonify({"error": "symbols required"}), 400
+    if len(syms) > QUOTES_MAX:
+        return ojsonify({"error": f"At most {QUOTES_MAX} symbols per request"}), 400
+    results = _IO_POOL.map(quote_data, syms)
+    return ojsonify({"quotes": {sym: payload for sym, (payload, _) in zip(syms, results)}})
 
 # ── STATUS ────────────────────────────────────────────────────────────────────
 
@@ -1505,11 +2274,11 @@ def sync_sheets():
     """Manually push current morning go-list to Google Sheets."""
     morning = load_file(data_path("morning_golist.json"))
     if not morning or not morning.get("golist"):
-        return jsonify({"error": "No morning go-list found. Run morning scan first."}), 400
+        return ojsonify({"error": "No morning go-list found. Run morning scan first."}), 400
     result = sync_morning_to_sheets(morning)
     if result.get("ok"):
-        return jsonify(result)
-    return jsonify(result), 500
+        return ojsonify(result)
+    return ojsonify(result), 500
 
 @app.route('/api/sheet-status')
 @admin_required
@@ -1524,7 +2293,7 @@ def sheet_status():
     sheet_id   = os.environ.get("GOOGLE_SHEET_ID", "")
     saved      = load_file(data_path("sheet_id.json")) or {}
     sheet_url  = f"https://docs.google.com/spreadsheets/d/{sheet_id}" if sheet_id else saved.get("url", "")
-    return jsonify({
+    return ojsonify({
         "configured":       configured,
         "gspread_installed": GSHEETS_AVAILABLE,
         "has_credentials":  bool(os.environ.get("GOOGLE_CREDENTIALS_JSON") or os.path.exists("google_credentials.json")),
@@ -1536,7 +2305,7 @@ def sheet_status():
 def debug_auth():
     """Shows auth config status — no passwords exposed, just confirms vars are set."""
     users = get_users()
-    return jsonify({
+    return ojsonify({
         'ADMIN_USER_set':   bool(os.environ.get('ADMIN_USER')),
         'ADMIN_USER_value': os.environ.get('ADMIN_USER', '(using default: admin)'),
         'ADMIN_PASS_set':   bool(os.environ.get('ADMIN_PASS')),
@@ -1563,13 +2332,13 @@ def get_chart_data(symbol):
             interval = '5m'
 
         symbol = symbol.upper().strip()
-        ticker = yf.Ticker(symbol)
+        ticker = _ticker(symbol)
 
         # Fetch with prepost for pre-market data
         df = ticker.history(period=period, interval=interval, prepost=True)
 
         if df is None or len(df) == 0:
-            return jsonify({'error': f'No data found for {symbol}'}), 404
+            return ojsonify({'error': f'No data found for {symbol}'}), 404
 
         # Calculate VWAP
         typical = (df['High'] + df['Low'] + df['Close']) / 3
@@ -1583,7 +2352,7 @@ def get_chart_data(symbol):
 
         # Get ticker info for additional context
         try:
-            info = ticker.info
+            info = ticker_info(symbol, ticker)
             company_name = info.get('shortName', symbol)
             prev_close   = round(float(info.get('previousClose', 0) or 0), 2)
         except:
@@ -1603,9 +2372,9 @@ def get_chart_data(symbol):
         for i, (ts, row) in enumerate(df.iterrows()):
             try:
                 c_price = safe(row['Close'])
-                vwap_val = safe(vwap_series.iloc[i], c_price)
-                ema9_val = safe(ema9.iloc[i], c_price)
-                ema20_val = safe(ema20.iloc[i], c_price)
+                vwap_val = safe(vwap_series.iat[i], c_price)
+                ema9_val = safe(ema9.iat[i], c_price)
+                ema20_val = safe(ema20.iat[i], c_price)
                 candles.append({
                     't':    int(ts.timestamp() * 1000),
                     'o':    safe(row['Open']),
@@ -1621,7 +2390,7 @@ def get_chart_data(symbol):
                 continue
 
         if not candles:
-            return jsonify({'error': 'Could not process candle data'}), 404
+            return ojsonify({'error': 'Could not process candle data'}), 404
 
         last = candles[-1]
         change     = round(last['c'] - candles[0]['o'], 2)
@@ -1641,7 +2410,7 @@ def get_chart_data(symbol):
         except:
             pass
 
-        return jsonify({
+        return ojsonify({
             'symbol':      symbol,
             'name':        company_name,
             'interval':    interval,
@@ -1655,27 +2424,24 @@ def get_chart_data(symbol):
             'change_pct':  change_pct,
             'above_vwap':  last['c'] > last['vwap'],
             'pm_high':     pm_high,
-            'timestamp':   datetime.now().isoformat(),
+            'timestamp':   _now_strs()[0],
         })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return ojsonify({'error': str(e)}), 500
 
 @app.route('/api/daily-loss', methods=['GET','POST'])
 @login_required
 def daily_loss():
     """Track and enforce daily max loss limit."""
-    import json
     DATA_FILE = data_path("daily_loss.json")
 
     def load_loss():
-        try:
-            with open(DATA_FILE) as f: return json.load(f)
-        except: return {}
+        return load_file(DATA_FILE, mutable=True) or {}
 
     def save_loss(data):
-        with open(DATA_FILE, 'w') as f: json.dump(data, f)
+        save_file(DATA_FILE, data, pretty=False)
 
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = _now_strs()[1]
 
     if request.method == 'POST':
         body = request.get_json(silent=True) or {}
@@ -1717,7 +2483,7 @@ def daily_loss():
     used_pct = round(abs(min(0, total_pnl)) / max_loss_dollar * 100, 1) if max_loss_dollar > 0 else 0
     trading_halted = total_pnl <= -max_loss_dollar
 
-    return jsonify({
+    return ojsonify({
         'today': today,
         'account': account,
         'max_loss_pct': max_loss_pct,
@@ -1731,14 +2497,21 @@ def daily_loss():
         'status': 'HALTED' if trading_halted else 'CAUTION' if used_pct > 66 else 'OK'
     })
 
+_STATUS_BODY = (None, b"")   # ((epoch second, has_results), encoded body)
+
 @app.route('/api/status')
 def status():
-    return jsonify({
-        "status": "running",
-        "version": "5.0",
-        "time": datetime.now().isoformat(),
-        "has_results": latest_results is not None
-    })
+    # Health checks poll this constantly; the body only changes once a second
+    global _STATUS_BODY
+    key = (int(time.time()), latest_results is not None)
+    if _STATUS_BODY[0] != key:
+        _STATUS_BODY = (key, orjson.dumps({
+            "status": "running",
+            "version": "5.0",
+            "time": _now_strs()[0],
+            "has_results": key[1]
+        }))
+    return Response(_STATUS_BODY[1], mimetype='application/json')
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -14,6 +14,7 @@ All 10 Improvements:
 """
 
 import os, json, time, math, requests
+import orjson
 import yfinance as yf
 from datetime import datetime, timedelta
 import pandas as pd
@@ -241,30 +242,39 @@ def safe_fetch(symbol, period="30d", interval="1d", prepost=False, retries=2):
 def load_json(fp, default=None):
     try:
         if os.path.exists(fp):
-            with open(fp) as f:
-                return json.load(f)
+            with open(fp, "rb") as f:
+                raw = f.read()
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                return json.loads(raw)   # older files written by json.dump may contain NaN
     except: pass
     return default if default is not None else {}
 
-def make_serializable(obj):
-    if isinstance(obj, dict):
-        return {k: make_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_serializable(i) for i in obj]
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    return obj
+def _np_default(obj):
+    # orjson calls this only for types it can't encode itself (OPT_SERIALIZE_NUMPY already covers
+    # contiguous arrays and numpy scalars), so the tree is walked once, inside orjson
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
 
 def save_json(fp, data):
+    # Serialize once, write a temp file next to the target, then swap it in: the web process
+    # reads these files while a scan is running and must never see a half-written one.
+    # No fsync — a lost write after a crash is recovered by the next scan / the Sheets restore.
+    tmp = f"{fp}.{os.getpid()}.tmp"
     try:
-        with open(fp, "w") as f:
-            json.dump(make_serializable(data), f, indent=2)
+        body = orjson.dumps(data, default=_np_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        with open(tmp, "wb", buffering=1 << 20) as f:
+            f.write(body)
+        os.replace(tmp, fp)
     except Exception as e:
         print(f"Error saving {fp}: {e}")
+        try: os.remove(tmp)
+        except OSError: pass
 
 # ─── IMPROVEMENT 1: FIRST-15-MIN VOLUME CONFIRMATION ─────────────────────────
 
@@ -400,7 +410,7 @@ def get_premarket_change(ticker_obj):
         if pm.empty: return 0
         prev = df[df.index.date < today]['Close']
         if prev.empty: return 0
-        return round(((pm['Close'].iloc[-1] - prev.iloc[-1]) / prev.iloc[-1]) * 100, 2)
+        return round(float((pm['Close'].iloc[-1] - prev.iloc[-1]) / prev.iloc[-1]) * 100, 2)
     except: return 0
 
 # ─── IMPROVEMENT 7: NEWS SENTIMENT SCORING ───────────────────────────────────
@@ -585,7 +595,7 @@ def check_weekly_trend(symbol):
 def calculate_gap_percent(df):
     try:
         if len(df) < 2: return 0
-        return round(((df['Open'].iloc[-1] - df['Close'].iloc[-2]) / df['Close'].iloc[-2]) * 100, 2)
+        return round(float((df['Open'].iloc[-1] - df['Close'].iloc[-2]) / df['Close'].iloc[-2]) * 100, 2)
     except: return 0
 
 def calculate_relative_volume(df):
@@ -604,7 +614,7 @@ def calculate_atr(df, period=7):
 
 def calculate_atr_percent(df):
     try:
-        atr = calculate_atr(df); last = df['Close'].iloc[-1]
+        atr = calculate_atr(df); last = float(df['Close'].iloc[-1])
         return round((atr / last) * 100, 2)
     except: return 0
 